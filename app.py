@@ -1,152 +1,214 @@
 import sys
-import os
-import smtplib
-import pandas as pd
 import time
 import csv
 from datetime import datetime
-from threading import Thread
-from urllib.parse import urljoin
-import re
-import requests
-from bs4 import BeautifulSoup
+from importlib.util import find_spec
 
 from PySide6.QtWidgets import (QApplication, QMainWindow, QWidget, QVBoxLayout, 
                                QHBoxLayout, QPushButton, QLabel, QPlainTextEdit, 
                                QProgressBar, QTabWidget, QFileDialog, QSpinBox,
                                QLineEdit, QFormLayout, QGroupBox, QCheckBox,
-                               QTableWidget, QTableWidgetItem, QHeaderView,
-                               QMessageBox, QComboBox, QFrame, QScrollArea, QSplitter)
+                               QTableView, QHeaderView,
+                               QMessageBox, QComboBox, QFrame, QScrollArea, QSplitter,
+                               QDoubleSpinBox, QListView)
 from PySide6.QtCore import Qt, QThread, QTimer, Signal, QSettings
 from PySide6.QtGui import QFont, QPalette, QColor, QIcon
-from PySide6.QtWebEngineWidgets import QWebEngineView  
-try:
-    from ddgs import DDGS
-    DDGS_AVAILABLE = True
-except ImportError:
-    DDGS_AVAILABLE = False
-    print("Warning: ddgs library not found. Please install with: pip install duckduckgo-search")
+from crawler import MAX_WORKERS, PER_HOST
+from politeness import HOST_DELAY
+from scrape_cache import CACHE_TTL
+from search import read_queries
+from models import RecipientListModel, AgencyTableModel, agency_proxy, PENDING, SENT, FAILED
+from send_log import SendLog
+from workflow import search_sites, scrape_sites, send_stream, send_async, SEND_QUEUE_PATH, SEND_LOG_PATH
+
+# The scraping and sending engines (requests, smtplib, asyncio, DNS, SQLite)
+# are imported where they are first used, so the window opens without them.
+AIOSMTPLIB_AVAILABLE = find_spec("aiosmtplib") is not None
+
+SEND_PER_SECOND = 0.33
+SEND_LOG_LINES = 1000
 
 class ScrapingThread(QThread):
     progress_updated = Signal(int, str)
-    data_scraped = Signal(list)
+    agencies_scraped = Signal(list)
+    stats_updated = Signal(dict)
     finished = Signal()
     
-    def __init__(self, query, max_results):
+    # Results reach the GUI in batches so a fast crawl can't flood the event loop
+    BATCH_SIZE = 25
+    BATCH_INTERVAL = 0.25
+    
+    def __init__(self, queries, max_results, max_workers=MAX_WORKERS, per_host=PER_HOST,
+                 cache_ttl=CACHE_TTL, delay=HOST_DELAY, skip_known=False):
         super().__init__()
-        self.query = query
+        self.queries = queries
         self.max_results = max_results
+        self.max_workers = max_workers
+        self.per_host = per_host
+        self.cache_ttl = cache_ttl
+        self.delay = delay
+        self.skip_known = skip_known
         
     def run(self):
-        if not DDGS:
+        if not find_spec("ddgs"):
             self.progress_updated.emit(0, "Error: ddgs library not installed. Please install with: pip install duckduckgo-search")
             self.finished.emit()
             return
-            
-        agencies = []
         try:
-            with DDGS() as ddgs:
-                results = ddgs.text(self.query, max_results=self.max_results)
-                total = len(list(results))
-                
-                with DDGS() as ddgs2:  # New instance for actual processing
-                    results = ddgs2.text(self.query, max_results=self.max_results)
-                    for i, r in enumerate(results):
-                        url = r.get("href")
-                        title = r.get("title", "")
-                        
-                        self.progress_updated.emit(int((i/total)*100), f"Scraping: {title[:50]}...")
-                        
-                        emails, links = self.scrape_website(url, deep=True)
-                        agencies.append({
-                            "title": title,
-                            "url": url,
-                            "emails": emails,
-                            "links": links
-                        })
-                        
-            self.data_scraped.emit(agencies)
+            searched = []
+            
+            def on_query(query, hits):
+                searched.append(query)
+                self.progress_updated.emit(
+                    0, f"Searched {len(searched)}/{len(self.queries)}: {query} ({len(hits)} hits)")
+            
+            def on_search_error(query, e):
+                self.progress_updated.emit(0, f"Search failed for {query}: {e}")
+            
+            self.progress_updated.emit(0, f"Searching: {self.queries[0]}..." if len(self.queries) == 1
+                                       else f"Running {len(self.queries)} searches...")
+            # Hits from all queries are merged, each URL once, before anything is crawled;
+            # searches run recently come from the cache without asking DuckDuckGo again
+            results, stats = search_sites(self.queries, self.max_results,
+                                          on_query=on_query, on_error=on_search_error)
+            
+            # Sites seen recently come straight from the index; one hit per site is crawled
+            plan = {"total": 0}
+            agencies = scrape_sites(results, self.max_workers, self.per_host, self.cache_ttl,
+                                    delay=self.delay, skip_known=self.skip_known,
+                                    on_plan=lambda total: plan.update(total=total), stats=stats)
+            batch = []
+            last_emit = time.monotonic()
+            for i, agency in enumerate(agencies, 1):
+                batch.append(agency)
+                now = time.monotonic()
+                if len(batch) >= self.BATCH_SIZE or now - last_emit >= self.BATCH_INTERVAL:
+                    self.emit_batch(batch, dict(stats), i, plan["total"])
+                    batch = []
+                    last_emit = now
+            if batch:
+                self.emit_batch(batch, dict(stats), plan["total"], plan["total"])
+            if not plan["total"]:
+                self.stats_updated.emit(dict(stats))
         except Exception as e:
             self.progress_updated.emit(0, f"Error: {str(e)}")
         finally:
             self.finished.emit()
-    
-    def scrape_website(self, url, deep=False):
-        emails, links = [], []
-        try:
-            headers = {"User-Agent": "Mozilla/5.0"}
-            response = requests.get(url, headers=headers, timeout=10)
-            response.raise_for_status()
             
-            soup = BeautifulSoup(response.text, "html.parser")
-            text = soup.get_text()
-            emails = list(set(re.findall(r"[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}", text)))
-            links = [a["href"] for a in soup.find_all("a", href=True)]
-            
-            if deep:
-                important_links = [
-                    l for l in links 
-                    if any(word in l.lower() for word in ["contact", "about", "team", "support"])
-                ]
-                
-                for l in important_links[:3]:
-                    full_url = urljoin(url, l)
-                    sub_emails, _ = self.scrape_website(full_url, deep=False)
-                    emails.extend(sub_emails)
-        except Exception as e:
-            pass
-        
-        return list(set(emails)), links
+    def emit_batch(self, batch, stats, done, total):
+        self.agencies_scraped.emit(batch)
+        self.stats_updated.emit(stats)
+        progress = min(int((done/max(total, 1))*100), 100)
+        self.progress_updated.emit(progress, f"Scraped: {batch[-1]['title'][:50]}...")
 
 class EmailSenderThread(QThread):
+    """Sends a campaign in the background.
+    
+    Per-recipient results go to `send_log` rather than a signal per
+    message; the window drains the log on a timer.
+    """
     progress_updated = Signal(int, str)
-    email_sent = Signal(str, bool, str)
     finished = Signal(int, int)
     
-    def __init__(self, emails, smtp_config, sender_email, subject, plain_text):
+    def __init__(self, emails, smtp_config, sender_email, subject, plain_text,
+                 connections=1, per_second=SEND_PER_SECOND, per_hour=None, send_queue=None,
+                 resolver=None, send_log=None):
         super().__init__()
         self.emails = emails
         self.smtp_config = smtp_config
         self.sender_email = sender_email
         self.subject = subject
         self.plain_text = plain_text
+        self.connections = connections
+        self.per_second = per_second
+        self.per_hour = per_hour
+        self.send_queue = send_queue
+        self.resolver = resolver
+        self.send_log = send_log or SendLog()
+        
+    def start_campaign(self):
+        """Fail dead domains up front; returns who to send to."""
+        if not self.resolver:
+            return self.emails
+        self.progress_updated.emit(0, "Checking recipient domains...")
+        deliverable, undeliverable = self.resolver.partition(self.emails)
+        for email in undeliverable:
+            self.record_result(email, False, "Domain has no mail server")
+        return deliverable
         
     def run(self):
-        successful = 0
-        failed = 0
-        
-        # Import MIME libraries here to avoid import issues
-        from email.mime.multipart import MIMEMultipart
-        from email.mime.text import MIMEText
-        
-        for i, email in enumerate(self.emails):
-            try:
-                # Create MIME multipart message for text emails
-                msg = MIMEMultipart()
-                msg['Subject'] = self.subject
-                msg['From'] = self.sender_email
-                msg['To'] = email
-                
-                # Add  plain text 
-                msg.attach(MIMEText(self.plain_text, 'plain'))
-               
-                
-                with smtplib.SMTP(self.smtp_config['host'], self.smtp_config['port']) as server:
-                    server.starttls()
-                    server.login(self.smtp_config['username'], self.smtp_config['password'])
-                    server.sendmail(self.sender_email, email, msg.as_string())
-                
-                successful += 1
-                self.email_sent.emit(email, True, "Success")
-                self.progress_updated.emit(int((i+1)/len(self.emails)*100), f"Sent to {email}")
-                time.sleep(3)  # Rate limiting
-                
-            except Exception as e:
-                failed += 1
-                self.email_sent.emit(email, False, str(e))
-                time.sleep(5)
+        try:
+            send_stream(self.start_campaign(), self.smtp_config, self.sender_email, self.subject,
+                        self.plain_text, connections=self.connections, per_second=self.per_second,
+                        per_hour=self.per_hour, on_result=self.record_result)
+        except Exception as e:
+            self.progress_updated.emit(0, f"Error: {str(e)}")
+        
+        self.finish_campaign()
+        
+    def record_result(self, email, success, message, code=None, latency=None):
+        if self.send_queue:
+            self.send_queue.mark(email, success, message)
+        self.send_log.record(email, success, message, code, latency)
+        
+    def finish_campaign(self):
+        # Commit the last batch of results before reporting completion
+        if self.send_queue:
+            self.send_queue.flush()
+        self.send_log.close()
+        self.finished.emit(self.send_log.successful, self.send_log.failed)
+
+class AsyncEmailSenderThread(EmailSenderThread):
+    """Same signals as EmailSenderThread, but every connection shares one asyncio loop."""
+    
+    def run(self):
+        try:
+            send_async(self.start_campaign(), self.smtp_config, self.sender_email, self.subject,
+                       self.plain_text, connections=self.connections,
+                       per_second=self.per_second, per_hour=self.per_hour,
+                       on_result=self.record_result)
+        except Exception as e:
+            self.progress_updated.emit(0, f"Error: {str(e)}")
+        
+        self.finish_campaign()
+
+class RecipientLoaderThread(QThread):
+    emails_loaded = Signal(list)
+    error = Signal(str)
+    finished = Signal(int)
+    
+    CHUNK_SIZE = 2000
+    
+    def __init__(self, filename, resolver=None):
+        super().__init__()
+        self.filename = filename
+        self.resolver = resolver
+        
+    def run(self):
+        from recipients import iter_recipients
         
-        self.finished.emit(successful, failed)
+        loaded = 0
+        chunk = []
+        try:
+            # Streams just the email column, validated and deduped in file order
+            for email in iter_recipients(self.filename):
+                chunk.append(email)
+                if len(chunk) >= self.CHUNK_SIZE:
+                    loaded += self.emit_chunk(chunk)
+                    chunk = []
+            if chunk:
+                loaded += self.emit_chunk(chunk)
+        except Exception as e:
+            self.error.emit(str(e))
+        finally:
+            self.finished.emit(loaded)
+            
+    def emit_chunk(self, chunk):
+        if self.resolver:
+            chunk, _ = self.resolver.partition(chunk)
+        self.emails_loaded.emit(chunk)
+        return len(chunk)
+
 class ProfessionalButton(QPushButton):
     def __init__(self, text, primary=False):
         super().__init__(text)
@@ -216,7 +278,6 @@ class AgencyOutreachApp(QMainWindow):
         super().__init__()
         self.settings = QSettings('AgencyOutreach', 'Settings')
         self.dark_mode = self.settings.value('dark_mode', False, bool)
-        self.scraped_data = []
         from PySide6.QtGui import QShortcut, QKeySequence
         self.shortcut_fullscreen = QShortcut(QKeySequence("F11"), self)
         self.shortcut_fullscreen.activated.connect(self.toggle_fullscreen)
@@ -302,15 +363,52 @@ class AgencyOutreachApp(QMainWindow):
         config_layout.setContentsMargins(15, 20, 15, 15)
         config_layout.setSpacing(10)
         
-        self.query_input = QLineEdit("landscaping agencies UK")
-        self.query_input.setMinimumHeight(35)
-        config_layout.addRow("Search Query:", self.query_input)
+        self.query_input = QPlainTextEdit("landscaping agencies UK")
+        self.query_input.setPlaceholderText("One search query per line, e.g. one per city or service")
+        self.query_input.setFixedHeight(80)
+        load_queries_btn = ProfessionalButton("📂 Load Queries")
+        load_queries_btn.clicked.connect(self.load_queries)
+        query_layout = QHBoxLayout()
+        query_layout.addWidget(self.query_input)
+        query_layout.addWidget(load_queries_btn, 0, Qt.AlignTop)
+        config_layout.addRow("Search Queries:", query_layout)
         
         self.max_results_spin = QSpinBox()
         self.max_results_spin.setRange(1, 100)
         self.max_results_spin.setValue(30)
         self.max_results_spin.setMinimumHeight(35)
-        config_layout.addRow("Max Results:", self.max_results_spin)
+        config_layout.addRow("Results Per Query:", self.max_results_spin)
+        
+        self.max_workers_spin = QSpinBox()
+        self.max_workers_spin.setRange(1, 64)
+        self.max_workers_spin.setValue(MAX_WORKERS)
+        self.max_workers_spin.setMinimumHeight(35)
+        config_layout.addRow("Parallel Sites:", self.max_workers_spin)
+        
+        self.per_host_spin = QSpinBox()
+        self.per_host_spin.setRange(1, 8)
+        self.per_host_spin.setValue(PER_HOST)
+        self.per_host_spin.setMinimumHeight(35)
+        config_layout.addRow("Per-Host Limit:", self.per_host_spin)
+        
+        self.host_delay_spin = QDoubleSpinBox()
+        self.host_delay_spin.setRange(0, 30)
+        self.host_delay_spin.setSingleStep(0.5)
+        self.host_delay_spin.setValue(HOST_DELAY)
+        self.host_delay_spin.setSuffix(" s")
+        self.host_delay_spin.setMinimumHeight(35)
+        config_layout.addRow("Delay Per Site:", self.host_delay_spin)
+        
+        self.cache_ttl_spin = QSpinBox()
+        self.cache_ttl_spin.setRange(0, 24 * 90)
+        self.cache_ttl_spin.setValue(CACHE_TTL // 3600)
+        self.cache_ttl_spin.setSuffix(" h")
+        self.cache_ttl_spin.setSpecialValueText("Always revalidate")
+        self.cache_ttl_spin.setMinimumHeight(35)
+        config_layout.addRow("Cache TTL:", self.cache_ttl_spin)
+        
+        self.skip_known_check = QCheckBox("Only show sites not scraped before")
+        config_layout.addRow("", self.skip_known_check)
         
         scraper_layout.addWidget(config_group)
         
@@ -339,13 +437,33 @@ class AgencyOutreachApp(QMainWindow):
         self.progress_label.setWordWrap(True)  # Allow text wrapping
         scraper_layout.addWidget(self.progress_label)
         
+        self.scrape_stats_label = QLabel()
+        self.scrape_stats_label.setVisible(False)
+        scraper_layout.addWidget(self.scrape_stats_label)
+        
+        self.results_filter = QLineEdit()
+        self.results_filter.setPlaceholderText("Filter results...")
+        self.results_filter.setMinimumHeight(35)
+        scraper_layout.addWidget(self.results_filter)
+        
         # Results table with stretch
-        self.results_table = QTableWidget()
-        self.results_table.setColumnCount(3)
-        self.results_table.setHorizontalHeaderLabels(["Title", "URL", "Emails"])
-        self.results_table.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeMode.Stretch)
+        self.results_model = AgencyTableModel(self)
+        self.results_proxy = agency_proxy(self.results_model, self)
+        self.results_filter.textChanged.connect(self.results_proxy.setFilterFixedString)
+        self.results_table = QTableView()
+        self.results_table.setModel(self.results_proxy)
+        self.results_table.setSortingEnabled(True)
+        self.results_table.sortByColumn(-1, Qt.SortOrder.AscendingOrder)
+        # Fixed column widths and row heights: appending rows never re-measures the table
+        header = self.results_table.horizontalHeader()
+        header.setSectionResizeMode(QHeaderView.ResizeMode.Interactive)
+        header.setStretchLastSection(True)
+        header.resizeSection(0, 260)
+        header.resizeSection(1, 300)
+        self.results_table.verticalHeader().setSectionResizeMode(QHeaderView.ResizeMode.Fixed)
+        self.results_table.setWordWrap(False)
         self.results_table.setAlternatingRowColors(True)
-        self.results_table.setSelectionBehavior(QTableWidget.SelectionBehavior.SelectRows)
+        self.results_table.setSelectionBehavior(QTableView.SelectionBehavior.SelectRows)
         
         # Make table expandable
         scraper_layout.addWidget(self.results_table, 1)  # The '1' makes it stretch
@@ -397,6 +515,32 @@ class AgencyOutreachApp(QMainWindow):
         self.sender_email.setMinimumHeight(35)
         smtp_layout.addRow("Sender Email:", self.sender_email)
         
+        self.smtp_connections = QSpinBox()
+        self.smtp_connections.setRange(1, 16)
+        self.smtp_connections.setValue(1)
+        self.smtp_connections.setMinimumHeight(35)
+        smtp_layout.addRow("Connections:", self.smtp_connections)
+        
+        self.send_per_second = QDoubleSpinBox()
+        self.send_per_second.setRange(0.01, 100)
+        self.send_per_second.setValue(SEND_PER_SECOND)
+        self.send_per_second.setMinimumHeight(35)
+        smtp_layout.addRow("Emails/Second:", self.send_per_second)
+        
+        self.send_per_hour = QSpinBox()
+        self.send_per_hour.setRange(0, 1000000)
+        self.send_per_hour.setValue(0)
+        self.send_per_hour.setSpecialValueText("Unlimited")
+        self.send_per_hour.setMinimumHeight(35)
+        smtp_layout.addRow("Emails/Hour:", self.send_per_hour)
+        
+        self.send_engine = QComboBox()
+        self.send_engine.addItem("Threads", EmailSenderThread)
+        if AIOSMTPLIB_AVAILABLE:
+            self.send_engine.addItem("Asyncio", AsyncEmailSenderThread)
+        self.send_engine.setMinimumHeight(35)
+        smtp_layout.addRow("Send Engine:", self.send_engine)
+        
         email_layout.addWidget(smtp_group)
         
                 # Email content
@@ -440,13 +584,52 @@ class AgencyOutreachApp(QMainWindow):
         self.use_scraped_btn.setEnabled(False)
         file_layout.addWidget(self.use_scraped_btn)
         
+        self.check_mx = QCheckBox("Verify domains (DNS)")
+        self.check_mx.setToolTip("Drop addresses whose domain has no mail server")
+        file_layout.addWidget(self.check_mx)
+        
         file_layout.addStretch()
         list_layout.addLayout(file_layout)
         
-        self.email_list = QPlainTextEdit()
-        self.email_list.setPlaceholderText("Email addresses will appear here...")
+        filter_layout = QHBoxLayout()
+        self.recipient_filter = QLineEdit()
+        self.recipient_filter.setPlaceholderText("Filter addresses...")
+        self.recipient_filter.setMinimumHeight(35)
+        filter_layout.addWidget(self.recipient_filter)
+        self.recipient_count_label = QLabel()
+        filter_layout.addWidget(self.recipient_count_label)
+        list_layout.addLayout(filter_layout)
+        
+        # Filtering runs once typing pauses rather than on every keystroke
+        self.filter_timer = QTimer(self)
+        self.filter_timer.setSingleShot(True)
+        self.filter_timer.setInterval(200)
+        self.filter_timer.timeout.connect(
+            lambda: self.recipients.set_filter(self.recipient_filter.text()))
+        self.recipient_filter.textChanged.connect(self.filter_timer.start)
+        
+        self.recipients = RecipientListModel(self)
+        self.email_list = QListView()
+        self.email_list.setModel(self.recipients)
+        self.email_list.setUniformItemSizes(True)
+        self.email_list.setMinimumHeight(200)
         list_layout.addWidget(self.email_list)
         
+        add_layout = QHBoxLayout()
+        self.add_email_input = QLineEdit()
+        self.add_email_input.setPlaceholderText("Add or paste addresses...")
+        self.add_email_input.setMinimumHeight(35)
+        self.add_email_input.returnPressed.connect(self.add_emails)
+        add_layout.addWidget(self.add_email_input)
+        self.clear_emails_btn = ProfessionalButton("Clear")
+        self.clear_emails_btn.clicked.connect(self.recipients.clear)
+        add_layout.addWidget(self.clear_emails_btn)
+        list_layout.addLayout(add_layout)
+        
+        self.recipients.modelReset.connect(self.update_recipient_count)
+        self.recipients.rowsInserted.connect(self.update_recipient_count)
+        self.recipients.counts_changed.connect(self.update_recipient_count)
+        
         email_layout.addWidget(list_group)
         
         # Send controls
@@ -470,6 +653,29 @@ class AgencyOutreachApp(QMainWindow):
         self.email_status_label.setWordWrap(True)
         email_layout.addWidget(self.email_status_label)
         
+        # Send log
+        log_group = QGroupBox("Send Log")
+        log_layout = QVBoxLayout(log_group)
+        self.send_log_view = QPlainTextEdit()
+        self.send_log_view.setReadOnly(True)
+        self.send_log_view.setMaximumBlockCount(SEND_LOG_LINES)
+        self.send_log_view.setMinimumHeight(120)
+        log_layout.addWidget(self.send_log_view)
+        
+        retry_layout = QHBoxLayout()
+        self.retry_failed_btn = ProfessionalButton("🔁 Retry Failed")
+        self.retry_failed_btn.clicked.connect(self.retry_failed)
+        self.retry_failed_btn.setEnabled(False)
+        retry_layout.addWidget(self.retry_failed_btn)
+        retry_layout.addStretch()
+        log_layout.addLayout(retry_layout)
+        email_layout.addWidget(log_group)
+        
+        # Results are pulled from the send log in batches instead of one signal each
+        self.log_timer = QTimer(self)
+        self.log_timer.setInterval(100)
+        self.log_timer.timeout.connect(self.flush_send_log)
+        
         # REMOVED THE STRETCH: email_layout.addStretch()
         
         # Set the container as the scroll area's widget
@@ -477,20 +683,34 @@ class AgencyOutreachApp(QMainWindow):
         
         self.tab_widget.addTab(email_scroll, "📧 Email Sender")
         
+    def load_queries(self):
+        filename, _ = QFileDialog.getOpenFileName(self, "Load Queries", "",
+                                                  "Text files (*.txt);;All files (*)")
+        if filename:
+            with open(filename, encoding="utf-8") as f:
+                self.query_input.setPlainText("\n".join(read_queries(f.read())))
+            
     def start_scraping(self):
-        query = self.query_input.text().strip()
-        if not query:
+        queries = read_queries(self.query_input.toPlainText())
+        if not queries:
             QMessageBox.warning(self, "Warning", "Please enter a search query.")
             return
             
         self.scraping_progress.setVisible(True)
         self.progress_label.setVisible(True)
         self.start_scraping_btn.setEnabled(False)
-        self.results_table.setRowCount(0)
-        
-        self.scraping_thread = ScrapingThread(query, self.max_results_spin.value())
+        self.results_model.clear()
+        self.scrape_stats_label.setVisible(False)
+        
+        self.scraping_thread = ScrapingThread(queries, self.max_results_spin.value(),
+                                              self.max_workers_spin.value(),
+                                              self.per_host_spin.value(),
+                                              self.cache_ttl_spin.value() * 3600,
+                                              self.host_delay_spin.value(),
+                                              self.skip_known_check.isChecked())
         self.scraping_thread.progress_updated.connect(self.update_scraping_progress)
-        self.scraping_thread.data_scraped.connect(self.display_scraped_data)
+        self.scraping_thread.agencies_scraped.connect(self.add_scraped_agencies)
+        self.scraping_thread.stats_updated.connect(self.update_scrape_stats)
         self.scraping_thread.finished.connect(self.scraping_finished)
         self.scraping_thread.start()
         
@@ -498,16 +718,29 @@ class AgencyOutreachApp(QMainWindow):
         self.scraping_progress.setValue(value)
         self.progress_label.setText(message)
         
-    def display_scraped_data(self, data):
-        self.scraped_data = data
-        self.results_table.setRowCount(len(data))
-        
-        for i, agency in enumerate(data):
-            self.results_table.setItem(i, 0, QTableWidgetItem(agency['title']))
-            self.results_table.setItem(i, 1, QTableWidgetItem(agency['url']))
-            emails_text = '\n'.join(agency['emails']) if agency['emails'] else 'None found'
-            self.results_table.setItem(i, 2, QTableWidgetItem(emails_text))
-        
+    def update_scrape_stats(self, stats):
+        hits = stats.get('cache_hits', 0) + stats.get('cache_revalidated', 0)
+        self.scrape_stats_label.setText(
+            f"Cache: {hits} hits ({stats.get('cache_revalidated', 0)} revalidated), "
+            f"{stats.get('cache_misses', 0)} misses"
+            + (f", {stats['robots_blocked']} blocked by robots.txt" if stats.get('robots_blocked') else "")
+            + (f", {stats['skipped']} skipped (not HTML)" if stats.get('skipped') else "")
+            + (f", {stats['truncated']} truncated" if stats.get('truncated') else ""))
+        if stats.get('search_hits'):
+            self.scrape_stats_label.setText(
+                self.scrape_stats_label.text() +
+                f"\nSearches: {stats['search_hits']} reused, {stats.get('search_misses', 0)} run")
+        known = stats.get('known_reused', 0) + stats.get('known_skipped', 0)
+        if known or stats.get('duplicate_hits'):
+            self.scrape_stats_label.setText(
+                self.scrape_stats_label.text() + 
+                f"\nSites: {known} already known ({stats.get('known_skipped', 0)} skipped), "
+                f"{stats.get('known_refreshed', 0)} refreshed, "
+                f"{stats.get('duplicate_hits', 0)} duplicate hits collapsed")
+        self.scrape_stats_label.setVisible(True)
+        
+    def add_scraped_agencies(self, agencies):
+        self.results_model.append(agencies)
         self.export_csv_btn.setEnabled(True)
         self.use_scraped_btn.setEnabled(True)
         
@@ -517,7 +750,7 @@ class AgencyOutreachApp(QMainWindow):
         self.start_scraping_btn.setEnabled(True)
         
     def export_to_csv(self):
-        if not self.scraped_data:
+        if not self.results_model.rowCount():
             return
             
         filename, _ = QFileDialog.getSaveFileName(self, "Save CSV", "agencies.csv", "CSV files (*.csv)")
@@ -525,7 +758,7 @@ class AgencyOutreachApp(QMainWindow):
             with open(filename, mode="w", newline="", encoding="utf-8") as file:
                 writer = csv.writer(file)
                 writer.writerow(["Title", "URL", "Emails"])
-                for agency in self.scraped_data:
+                for agency in self.results_model.agencies():
                     writer.writerow([
                         agency["title"],
                         agency["url"],
@@ -537,43 +770,79 @@ class AgencyOutreachApp(QMainWindow):
         filename, _ = QFileDialog.getOpenFileName(self, "Load File", "", 
                                                   "Excel/CSV files (*.xlsx *.xls *.csv)")
         if filename:
-            try:
-                if filename.lower().endswith('.csv'):
-                    df = pd.read_csv(filename)
-                else:
-                    df = pd.read_excel(filename)
-                # Try to find email column
-                email_columns = [col for col in df.columns if 'email' in col.lower()]
-                if not email_columns:
-                    email_columns = [col for col in df.columns if '@' in str(df[col].iloc[0]) if not pd.isna(df[col].iloc[0])]
-                if email_columns:
-                    emails = [e for e in df[email_columns[0]].dropna().tolist() if str(e).strip().lower() != "none found"]
-                    self.email_list.setPlainText('\n'.join(map(str, emails)))
-                    self.send_emails_btn.setEnabled(bool(emails))
-                else:
-                    QMessageBox.warning(self, "Warning", "No email column found in the file.")
-            except Exception as e:
-                QMessageBox.critical(self, "Error", f"Failed to load file: {str(e)}")
+            from email_validation import default_resolver
+            
+            self.recipients.clear()
+            self.load_excel_btn.setEnabled(False)
+            self.statusBar().showMessage("Loading addresses...")
+            resolver = default_resolver() if self.check_mx.isChecked() else None
+            self.loader_thread = RecipientLoaderThread(filename, resolver)
+            self.loader_thread.emails_loaded.connect(self.recipients.append_emails)
+            self.loader_thread.error.connect(self.recipient_load_failed)
+            self.loader_thread.finished.connect(self.recipients_loaded)
+            self.loader_thread.start()
+            
+    def recipients_loaded(self, count):
+        self.load_excel_btn.setEnabled(True)
+        self.statusBar().showMessage(f"Loaded {count} valid addresses", 8000)
+        
+    def recipient_load_failed(self, message):
+        QMessageBox.warning(self, "Warning", f"Failed to load file: {message}")
                 
     def use_scraped_emails(self):
-        if not self.scraped_data:
+        if not self.results_model.rowCount():
             return
+        from email_validation import validate_emails
             
         all_emails = []
-        for agency in self.scraped_data:
+        for agency in self.results_model.agencies():
             all_emails.extend(agency['emails'])
         
-        if all_emails:
-            self.email_list.setPlainText('\n'.join(all_emails))
-            self.send_emails_btn.setEnabled(True)
+        # Domains are checked off the GUI thread by EmailSenderThread.start_campaign
+        emails = validate_emails(all_emails, scraped=True)
+        if emails:
+            self.recipients.set_emails(emails)
+            self.report_validation(len(all_emails), len(emails))
         else:
-            QMessageBox.information(self, "Info", "No emails found in scraped data.")
+            QMessageBox.information(self, "Info", "No valid emails found in scraped data.")
+            
+    def add_emails(self):
+        from email_validation import validate_emails, SEPARATOR_RE
+        
+        entries = [e for e in SEPARATOR_RE.split(self.add_email_input.text()) if e]
+        added = self.recipients.append_emails(validate_emails(entries))
+        self.add_email_input.clear()
+        self.report_validation(len(entries), added)
+        
+    def update_recipient_count(self):
+        total, pending, sent, failed = self.recipients.counts()
+        text = f"{total} recipients"
+        if sent or failed:
+            text += f" · {sent} sent · {failed} failed"
+        shown = self.recipients.rowCount()
+        if shown != total:
+            text += f" · {shown} shown"
+        self.recipient_count_label.setText(text)
+        sending = hasattr(self, 'email_thread') and self.email_thread.isRunning()
+        self.send_emails_btn.setEnabled(total > 0 and not sending)
+            
+    def report_validation(self, found, kept):
+        if found > kept:
+            self.statusBar().showMessage(
+                f"Kept {kept} valid addresses, removed {found - kept} invalid or duplicate entries", 8000)
             
     def send_emails(self):
-        emails = [email.strip() for email in self.email_list.toPlainText().split('\n') if email.strip()]
+        self.start_campaign(self.recipients.emails())
+        
+    def retry_failed(self):
+        self.start_campaign(self.recipients.emails(FAILED), retry=True)
+        
+    def start_campaign(self, emails, retry=False):
         if not emails:
             QMessageBox.warning(self, "Warning", "No email addresses found.")
             return
+        from send_queue import SendQueue, campaign_id, MAX_ATTEMPTS
+        from email_validation import default_resolver
             
         smtp_config = {
             'host': self.smtp_host.text(),
@@ -586,31 +855,101 @@ class AgencyOutreachApp(QMainWindow):
         plain_text = self.email_message.toPlainText()
         html_content = None  # Not used for text-based emails
         
+        # Record progress on disk so an interrupted campaign can resume
+        self.send_queue = SendQueue(SEND_QUEUE_PATH,
+                                    campaign_id(self.sender_email.text(), subject, plain_text))
+        self.send_queue.add(emails)
+        if retry:
+            # The queue decides who is still worth retrying, so this also works after a restart
+            retryable = set(self.send_queue.pending(retry_failed=True))
+            given_up = sum(1 for email in emails if email not in retryable)
+            emails = [email for email in emails if email in retryable]
+            if given_up:
+                QMessageBox.information(
+                    self, "Retry Failed",
+                    f"{given_up} of these recipients have had {MAX_ATTEMPTS} attempts "
+                    "and won't be retried.")
+            if not emails:
+                self.send_queue.close()
+                return
+            already_sent = []
+        else:
+            already_sent = self.send_queue.sent(emails)
+        if already_sent:
+            reply = QMessageBox.question(
+                self, "Resume Campaign",
+                f"{len(already_sent)} of these recipients were already sent this email "
+                "in an earlier run.\nSkip them and resume where the campaign stopped?")
+            if reply == QMessageBox.StandardButton.Yes:
+                done = set(already_sent)
+                emails = [email for email in emails if email not in done]
+                self.recipients.set_statuses((email, SENT, None) for email in already_sent)
+            else:
+                self.send_queue.reset(already_sent)
+        self.recipients.set_statuses((email, PENDING, None) for email in emails)
+        if not emails:
+            self.send_queue.close()
+            QMessageBox.information(self, "Info", "Every recipient has already been sent this email.")
+            return
+        
         self.email_progress.setVisible(True)
         self.email_status_label.setVisible(True)
         self.send_emails_btn.setEnabled(False)
+        self.retry_failed_btn.setEnabled(False)
+        self.email_progress.setValue(0)
+        self.send_log_view.clear()
         
-        self.email_thread = EmailSenderThread(
+        self.send_log = SendLog(path=SEND_LOG_PATH, campaign=self.send_queue.campaign)
+        sender_class = self.send_engine.currentData()
+        self.email_thread = sender_class(
             emails, smtp_config, self.sender_email.text(),
-            subject, plain_text  # Use plain text for both
+            subject, plain_text,  # Use plain text for both
+            connections=self.smtp_connections.value(),
+            per_second=self.send_per_second.value(),
+            per_hour=self.send_per_hour.value() or None,
+            send_queue=self.send_queue,
+            resolver=default_resolver() if self.check_mx.isChecked() else None,
+            send_log=self.send_log
         )
         self.email_thread.progress_updated.connect(self.update_email_progress)
-        self.email_thread.email_sent.connect(self.email_sent_callback)
         self.email_thread.finished.connect(self.email_sending_finished)
         self.email_thread.start()
+        self.log_timer.start()
         
     def update_email_progress(self, value, message):
         self.email_progress.setValue(value)
         self.email_status_label.setText(message)
         
-    def email_sent_callback(self, email, success, message):
-        # You could add a log widget here to show individual email results
-        pass
+    def flush_send_log(self):
+        results = self.send_log.drain()
+        if not results:
+            return
+        self.recipients.set_statuses(
+            (r.email, SENT if r.success else FAILED, r.message) for r in results)
+        self.send_log_view.appendPlainText("\n".join(self.format_result(r) for r in results))
+        
+        done = self.send_log.successful + self.send_log.failed
+        last = results[-1]
+        status = "Sent to" if last.success else "Failed:"
+        self.update_email_progress(int(done/max(len(self.email_thread.emails), 1)*100),
+                                   f"{status} {last.email} ({self.send_log.rate():.1f} emails/min)")
+        
+    def format_result(self, result):
+        stamp = datetime.fromtimestamp(result.time).strftime("%H:%M:%S")
+        mark = "✓" if result.success else "✗"
+        code = result.code or "---"
+        latency = "" if result.latency is None else f" {result.latency * 1000:.0f}ms"
+        line = f"{stamp} {mark} {code} {result.email}{latency}"
+        return line if result.success else f"{line}  {result.message}"
         
     def email_sending_finished(self, successful, failed):
+        self.log_timer.stop()
+        self.flush_send_log()
+        self.send_queue.close()
         self.email_progress.setVisible(False)
         self.email_status_label.setVisible(False)
         self.send_emails_btn.setEnabled(True)
+        self.retry_failed_btn.setEnabled(failed > 0)
         
         QMessageBox.information(self, "Email Campaign Complete", 
                                f"Successfully sent: {successful}\nFailed: {failed}")
@@ -657,7 +996,7 @@ class AgencyOutreachApp(QMainWindow):
                 QLineEdit:focus, QTextEdit:focus, QSpinBox:focus {
                     border-color: #2B5CE6;
                 }
-                QTableWidget {
+                QTableView {
                     background-color: #374151;
                     alternate-background-color: #4B5563;
                     gridline-color: #6B7280;
@@ -725,7 +1064,7 @@ class AgencyOutreachApp(QMainWindow):
                 QLineEdit:focus, QTextEdit:focus, QSpinBox:focus {
                     border-color: #2B5CE6;
                 }
-                QTableWidget {
+                QTableView {
                     background-color: #FFFFFF;
                     alternate-background-color: #F9FAFB;
                     gridline-color: #E5E7EB;
@@ -0,0 +1,145 @@
+import asyncio
+import time
+
+from message_cache import MessageTemplate
+from rate_limit import TokenBucket, report_attempt, RATE_LIMIT_CODES
+from smtp_pool import MAX_MESSAGES_PER_CONNECTION, RECONNECT_CODES
+
+try:
+    import aiosmtplib
+    AIOSMTPLIB_AVAILABLE = True
+except ImportError:
+    AIOSMTPLIB_AVAILABLE = False
+
+
+def smtp_error_code(error):
+    """The SMTP reply code behind an aiosmtplib exception, or None."""
+    if isinstance(error, aiosmtplib.SMTPRecipientsRefused):
+        return error.recipients[0].code if error.recipients else None
+    return getattr(error, "code", None)
+
+
+def session_dropped(error):
+    if isinstance(error, (aiosmtplib.SMTPServerDisconnected, ConnectionError)):
+        return True
+    return smtp_error_code(error) in RECONNECT_CODES
+
+
+class AsyncSMTPSession:
+    """The asyncio counterpart of smtp_pool.SMTPConnection.
+
+    One authenticated session carrying many messages: RSET between
+    messages, a fresh session every `max_messages`, and one reconnect
+    and retry when the server drops it. A 421 is raised, not retried.
+    """
+
+    def __init__(self, host, port, username=None, password=None, starttls=True,
+                 timeout=30, max_messages=MAX_MESSAGES_PER_CONNECTION):
+        self.host = host
+        self.port = port
+        self.username = username
+        self.password = password
+        self.starttls = starttls
+        self.timeout = timeout
+        self.max_messages = max_messages
+        self.client = None
+        self.sent = 0
+
+    async def connect(self):
+        await self.close()
+        client = aiosmtplib.SMTP(hostname=self.host, port=self.port,
+                                 start_tls=self.starttls, timeout=self.timeout)
+        await client.connect()
+        try:
+            if self.username:
+                await client.login(self.username, self.password)
+        except Exception:
+            client.close()
+            raise
+        self.client = client
+        self.sent = 0
+
+    async def close(self):
+        if self.client is None:
+            return
+        try:
+            await self.client.quit()
+        except (aiosmtplib.SMTPException, OSError):
+            self.client.close()
+        self.client = None
+
+    async def _ready(self):
+        if self.client is None or self.sent >= self.max_messages:
+            await self.connect()
+        elif self.sent:
+            try:
+                response = await self.client.rset()
+                code = response.code
+            except (aiosmtplib.SMTPException, OSError):
+                code = None
+            if code != 250:
+                await self.connect()
+
+    async def send(self, sender, recipients, message):
+        await self._ready()
+        try:
+            result = await self.client.sendmail(sender, recipients, message)
+        except (aiosmtplib.SMTPException, ConnectionError) as e:
+            if not session_dropped(e):
+                self.sent += 1
+                raise
+            # A 421 means slow down: let send_campaign back off rather than resend now
+            if smtp_error_code(e) in RATE_LIMIT_CODES:
+                await self.close()
+                raise
+            await self.connect()
+            result = await self.client.sendmail(sender, recipients, message)
+        self.sent += 1
+        return result
+
+
+async def send_campaign(emails, smtp_config, sender_email, subject, plain_text,
+                        connections=4, per_second=1.0, per_hour=None, on_result=None):
+    """Send one email per address over `connections` sessions on the current loop.
+
+    `on_result(email, success, message, code, latency)` is called after
+    every attempt, with the SMTP reply code and the seconds the send took.
+    Returns (successful, failed).
+    """
+    if not AIOSMTPLIB_AVAILABLE:
+        raise RuntimeError("aiosmtplib library not installed. Please install with: pip install aiosmtplib")
+
+    template = MessageTemplate(sender_email, subject, plain_text)
+    limiter = TokenBucket(per_second, per_hour)
+    pending = asyncio.Queue()
+    for email in emails:
+        pending.put_nowait(email)
+    counts = {True: 0, False: 0}
+
+    def record(email, success, message, code, latency):
+        counts[success] += 1
+        if on_result:
+            on_result(email, success, message, code, latency)
+
+    async def worker():
+        session = AsyncSMTPSession(**smtp_config)
+        try:
+            while not pending.empty():
+                email = pending.get_nowait()
+                started = time.monotonic()
+                try:
+                    wait = limiter.reserve()
+                    while wait > 0:
+                        await asyncio.sleep(min(wait, 1.0))
+                        wait = limiter.reserve()
+                    started = time.monotonic()
+                    await session.send(sender_email, [email], template.render(email))
+                except Exception as e:
+                    report_attempt(email, started, limiter, record, e, smtp_error_code)
+                else:
+                    report_attempt(email, started, limiter, record)
+        finally:
+            await session.close()
+
+    await asyncio.gather(*(worker() for _ in range(connections)))
+    return counts[True], counts[False]
@@ -0,0 +1,75 @@
+"""Check extract.extract against the BeautifulSoup path and time both.
+
+Every page in benchmarks/fixtures must give the same visible-text emails
+and links as the old BeautifulSoup code with the default regex backend,
+otherwise the script exits non-zero. Differences in the optional lxml and
+selectolax backends (which, like browsers, treat CDATA in HTML as a
+comment) are only reported. Run from the repository root:
+
+    python benchmarks/bench_extract.py [iterations]
+"""
+import glob
+import os
+import sys
+import time
+
+from bs4 import BeautifulSoup
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from extract import BACKENDS, EMAIL_RE, extract, mailto_addresses
+
+FIXTURES = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures")
+
+
+def soup_extract(content):
+    soup = BeautifulSoup(content.decode("utf-8"), "html.parser")
+    emails = set(EMAIL_RE.findall(soup.get_text()))
+    links = [a["href"] for a in soup.find_all("a", href=True)]
+    return emails, links
+
+
+def check(pages):
+    ok = True
+    for name, content in pages:
+        expected_emails, expected_links = soup_extract(content)
+        expected_emails |= set(mailto_addresses(expected_links))
+        for backend in BACKENDS:
+            emails, links = extract(content, backend=backend)
+            if emails != expected_emails or links != expected_links:
+                if backend == "regex":
+                    ok = False
+                print(f"{'MISMATCH' if backend == 'regex' else 'differs'} {name} [{backend}]")
+                print(f"  emails only in soup:    {sorted(expected_emails - emails)}")
+                print(f"  emails only in extract: {sorted(emails - expected_emails)}")
+                if links != expected_links:
+                    print(f"  links differ: {len(expected_links)} vs {len(links)}")
+    return ok
+
+
+def timed(fn, pages, iterations):
+    start = time.perf_counter()
+    for _ in range(iterations):
+        for _, content in pages:
+            fn(content)
+    return time.perf_counter() - start
+
+
+def main(iterations):
+    pages = []
+    for path in sorted(glob.glob(os.path.join(FIXTURES, "*.html"))):
+        with open(path, "rb") as f:
+            pages.append((os.path.basename(path), f.read()))
+    if not check(pages):
+        sys.exit(1)
+    print(f"{len(pages)} fixture pages match the BeautifulSoup path")
+
+    size = sum(len(c) for _, c in pages) * iterations
+    baseline = timed(soup_extract, pages, iterations)
+    print(f"{'beautifulsoup':<14} {baseline:>8.3f}s {size / baseline / 1e6:>8.1f} MB/s")
+    for backend in BACKENDS:
+        elapsed = timed(lambda c: extract(c, backend=backend), pages, iterations)
+        print(f"{backend:<14} {elapsed:>8.3f}s {size / elapsed / 1e6:>8.1f} MB/s  x{baseline / elapsed:.1f}")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 50)
@@ -0,0 +1,140 @@
+"""Emails found per request: the old contact-link heuristic vs. Frontier.
+
+Crawls a set of synthetic agency sites through a fake session (no
+network): following the first three hrefs containing "contact", "about",
+"team" or "support" in document order, as scrape_website used to; with
+the scored Frontier from the homepage; and with sitemap discovery
+(Crawler(discover=True)) in front of it. Half the sites have a sitemap.
+Each is run twice on one Crawler, the second time with the sitemaps
+already read (pages themselves aren't cached). Run from the repository
+root:
+
+    python benchmarks/bench_frontier.py [sites]
+"""
+import os
+import random
+import sys
+from urllib.parse import urljoin, urlsplit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from crawler import Crawler
+
+CONTACT_WORDS = ["contact", "about", "team", "support"]
+
+NAV = [
+    ("/", "Home"), ("/services", "Services"), ("/blog", "Blog"),
+    ("/about-us", "About us"), ("/about-us#history", "Our history"),
+    ("/contact-us?utm_source=nav", "Contact"), ("/contact-us/", "Contact us"),
+    ("/support/faq", "FAQ"), ("/enquiries", "Get in touch"),
+]
+
+
+def build_site(host, rng):
+    """Pages of one site as {path: html}; most have an address on one page."""
+    pages = {path: "" for path in ["/", "/services", "/blog", "/about-us", "/about-us/people",
+                                   "/contact-us", "/support/faq", "/enquiries"]}
+    where = rng.choice(["/", "/contact-us", "/enquiries", "/about-us/people", None])
+    if where:
+        pages[where] += f"<p>Write to hello@{host}</p>"
+    nav = "".join(f'<a href="{path}">{text}</a>' for path, text in NAV)
+    for path in pages:
+        body = nav
+        if path == "/about-us":
+            body += '<a href="/about-us/people">Meet the people</a>'
+        if path == "/blog":
+            body += "".join(f'<a href="/blog/post-{i}">Post {i}</a>' for i in range(20))
+        pages[path] = f"<html><body>{body}{pages[path]}</body></html>"
+    if rng.random() < 0.5:
+        locs = "".join(f"<url><loc>https://{host}{path}</loc></url>" for path in pages)
+        pages["/sitemap.xml"] = f'<?xml version="1.0"?><urlset>{locs}</urlset>'
+    return pages
+
+
+class FakeError(Exception):
+    def __init__(self, response):
+        super().__init__(f"{response.status_code} error")
+        self.response = response
+
+
+class FakeResponse:
+    encoding = "utf-8"
+    apparent_encoding = "utf-8"
+    headers = {}
+
+    def __init__(self, html):
+        self.status_code = 404 if html is None else 200
+        self.content = (html or "").encode("utf-8")
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        pass
+
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            raise FakeError(self)
+
+    def iter_content(self, chunk_size):
+        return [self.content]
+
+
+class FakeSession:
+    def __init__(self, sites):
+        self.sites = sites
+        self.requests = 0
+
+    def get(self, url, headers=None, timeout=None, stream=False):
+        self.requests += 1
+        parts = urlsplit(url)
+        path = parts.path.rstrip("/") or "/"
+        return FakeResponse(self.sites[parts.hostname].get(path))
+
+    def close(self):
+        pass
+
+
+def old_heuristic(crawler, url):
+    emails, links = crawler.scrape_page(url)
+    important_links = [l for l in links if any(word in l.lower() for word in CONTACT_WORDS)]
+    for l in important_links[:crawler.max_subpages]:
+        emails.update(crawler.scrape_page(urljoin(url, l))[0])
+    return emails
+
+
+def run(sites, scrape, discover, passes=2):
+    """(emails found, requests made) for each pass over the sites."""
+    results = []
+    with Crawler(delay=0, robots=False, discover=discover) as crawler:
+        crawler.session = FakeSession(sites)
+        for _ in range(passes):
+            crawler.session.requests = found = 0
+            for host in sites:
+                found += len(scrape(crawler, f"https://{host}/"))
+            results.append((found, crawler.session.requests))
+    return results
+
+
+def main(count):
+    rng = random.Random(1)
+    sites = {f"agency{i}.example": None for i in range(count)}
+    for host in sites:
+        sites[host] = build_site(host, rng)
+    reachable = sum(any("hello@" in html for html in pages.values()) for pages in sites.values())
+    print(f"{count} sites, {reachable} with an address")
+
+    def deep(crawler, url):
+        return crawler.scrape_website(url, deep=True)[0]
+
+    for name, scrape, discover in [
+        ("important_links[:3]", old_heuristic, False),
+        ("Frontier", deep, False),
+        ("discovery + Frontier", deep, True),
+    ]:
+        for label, (found, requests) in zip(["", " (repeat)"], run(sites, scrape, discover)):
+            print(f"{name + label:30} {found:4} emails  {requests:5} requests  "
+                  f"{found / requests:.3f} emails/request")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 200)
@@ -0,0 +1,61 @@
+"""Compare per-recipient MIMEMultipart.as_string() with MessageTemplate.render.
+
+Run from the repository root:
+
+    python benchmarks/bench_mime.py [count ...]
+
+Peak traced memory is measured over the first 1,000 messages of each path.
+"""
+import os
+import sys
+import time
+import tracemalloc
+from email.mime.multipart import MIMEMultipart
+from email.mime.text import MIMEText
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from message_cache import MessageTemplate
+
+SENDER = "favourkaycee23@gmail.com"
+SUBJECT = "Business Partnership Opportunity"
+BODY = ("Hello,\n\nWe would love to talk about working together on upcoming "
+        "landscaping projects.\n\nKind regards,\nKelechukwu\n") * 5
+
+
+def per_recipient(count):
+    for i in range(count):
+        msg = MIMEMultipart()
+        msg['Subject'] = SUBJECT
+        msg['From'] = SENDER
+        msg['To'] = f"user{i}@example.com"
+        msg.attach(MIMEText(BODY, 'plain'))
+        msg.as_string()
+
+
+def cached(count):
+    template = MessageTemplate(SENDER, SUBJECT, BODY)
+    for i in range(count):
+        template.render(f"user{i}@example.com")
+
+
+def measure(fn, count):
+    start = time.perf_counter()
+    fn(count)
+    elapsed = time.perf_counter() - start
+    tracemalloc.start()
+    fn(min(count, 1000))
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return elapsed, peak
+
+
+def main(counts):
+    print(f"{'recipients':>10} {'path':<14} {'seconds':>9} {'msgs/sec':>11} {'peak KiB':>9}")
+    for count in counts:
+        for name, fn in [("as_string", per_recipient), ("template", cached)]:
+            elapsed, peak = measure(fn, count)
+            print(f"{count:>10} {name:<14} {elapsed:>9.2f} {count / elapsed:>11.0f} {peak / 1024:>9.1f}")
+
+
+if __name__ == "__main__":
+    main([int(n) for n in sys.argv[1:]] or [10_000, 100_000])
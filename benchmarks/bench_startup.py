@@ -0,0 +1,111 @@
+"""Time how long the GUI takes to import and to show its first window.
+
+Each measurement runs in a fresh interpreter. `python -X importtime`
+gives the cumulative import cost of app.py and its slowest imports, and a
+second child process times from launch to the first event-loop tick
+after the main window is shown. The script exits non-zero if any of the
+scraping/sending engines (or another heavy library) was loaded before the
+window appeared, so a stray top-level import is caught. Run from the
+repository root:
+
+    python benchmarks/bench_startup.py [runs]
+
+Without a display, Qt's offscreen platform is used.
+"""
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Modules that should only load once the scraper, loader or sender is used
+LAZY_MODULES = ["requests", "bs4", "lxml", "pandas", "openpyxl", "ddgs", "smtplib", "asyncio",
+                "aiosmtplib", "dns", "email.mime", "urllib.request", "http.client",
+                "PySide6.QtWebEngineWidgets",
+                "smtp_pool", "async_sender", "send_queue", "email_validation", "recipients"]
+
+FIRST_WINDOW = """
+import sys, time
+from PySide6.QtWidgets import QApplication
+from PySide6.QtCore import QTimer
+import app
+
+def shown():
+    loaded = [m for m in %r if m in sys.modules]
+    print(time.time(), ",".join(loaded), flush=True)
+    qt.quit()
+
+qt = QApplication(sys.argv)
+window = app.AgencyOutreachApp()
+window.show()
+QTimer.singleShot(0, shown)
+qt.exec()
+""" % LAZY_MODULES
+
+
+def child_env():
+    env = dict(os.environ)
+    if not env.get("DISPLAY") and not env.get("WAYLAND_DISPLAY"):
+        env.setdefault("QT_QPA_PLATFORM", "offscreen")
+    return env
+
+
+def import_times():
+    """(total app import µs, [(cumulative µs, module)] of app's direct imports)."""
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", "import app"],
+                            cwd=ROOT, env=child_env(), capture_output=True, text=True)
+    if result.returncode:
+        sys.exit(result.stderr)
+    total, top = 0, []
+    # Lines are printed as imports finish, so app's own imports come
+    # after everything the interpreter loads at startup (site, codecs...)
+    lines = result.stderr.splitlines()
+    app_line = next(i for i, line in enumerate(lines) if line.endswith("| app"))
+    first = max((i for i, line in enumerate(lines[:app_line]) if line.endswith("| site")),
+                default=-1) + 1
+    for line in lines[first:app_line + 1]:
+        _, cumulative, name = line.split("|")
+        if name.strip() == "app":
+            total = int(cumulative)
+        elif name.startswith("   ") and not name.startswith("    "):
+            top.append((int(cumulative), name.strip()))
+    return total, sorted(top, reverse=True)
+
+
+def time_to_first_window():
+    """(seconds from launch to the first event after show(), lazy modules loaded)."""
+    start = time.time()
+    result = subprocess.run([sys.executable, "-c", FIRST_WINDOW], cwd=ROOT, env=child_env(),
+                            capture_output=True, text=True)
+    lines = [l for l in result.stdout.splitlines() if l.strip()]
+    if result.returncode or not lines:
+        sys.exit(result.stderr)
+    # The child stamps the moment the window is up, so its shutdown isn't counted
+    shown, _, loaded = lines[-1].partition(" ")
+    return float(shown) - start, [m for m in loaded.split(",") if m]
+
+
+def main(runs):
+    total, top = import_times()
+    print(f"import app: {total / 1000:.1f} ms cumulative; slowest direct imports:")
+    for cumulative, name in top[:8]:
+        print(f"  {cumulative / 1000:>7.1f} ms  {name}")
+
+    times, loaded = [], set()
+    for _ in range(runs):
+        elapsed, modules = time_to_first_window()
+        times.append(elapsed)
+        loaded.update(modules)
+    print(f"\ntime to first window over {runs} runs: median {statistics.median(times):.3f}s, "
+          f"min {min(times):.3f}s")
+
+    if loaded:
+        print(f"\n❌ Loaded before the window appeared: {', '.join(sorted(loaded))}")
+        sys.exit(1)
+    print("\n✓ No scraping or sending engine loaded at startup")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 5)
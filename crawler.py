@@ -0,0 +1,413 @@
+import queue
+import threading
+from collections import Counter, defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urljoin, urlparse, urlsplit
+
+from extract import extract_page
+from frontier import Frontier
+from politeness import HostScheduler, RobotsCache, Disallowed, HOST_DELAY, host_of
+from sitemap import parse_sitemap, child_sitemaps, contact_pages
+from urls import site_key
+
+HEADERS = {"User-Agent": "Mozilla/5.0"}
+
+MAX_WORKERS = 16
+PER_HOST = 2
+# Statuses of pages that simply aren't there, which aren't worth reporting
+MISSING = (404, 410)
+# Bytes of a page read before the rest is dropped; contact details are rarely past it
+MAX_BYTES = 2 * 1024 * 1024
+CHUNK_SIZE = 64 * 1024
+# Content-Types worth extracting from; a response without one is read too
+PAGE_TYPES = ("text/html", "application/xhtml+xml", "text/plain")
+
+
+class Skipped(Exception):
+    """The response isn't a page (a PDF, an image...), so its body wasn't downloaded."""
+
+
+class Fetched:
+    """What fetch() got: the status, headers and body, cut off at max_bytes.
+
+    `encoding` is the charset the headers declared, if any.
+    """
+
+    def __init__(self, status_code, headers, content=b"", encoding=None):
+        self.status_code = status_code
+        self.headers = headers
+        self.content = content
+        self.encoding = encoding
+
+
+def make_session(max_workers=MAX_WORKERS, per_host=PER_HOST, retries=2):
+    """A keep-alive session whose pools match the crawl's concurrency limits.
+
+    One pool is kept per host (enough for every site in flight), each with
+    `per_host` connections, so a site's contact/about follow-ups reuse the
+    connection that fetched its homepage. Transient failures are retried
+    with backoff; requests already asks for gzip/deflate transfer.
+    """
+    # Imported here so the GUI can read this module's defaults without loading requests
+    import requests
+    from requests.adapters import HTTPAdapter
+    from urllib3.util.retry import Retry
+
+    retry = Retry(total=retries, backoff_factor=0.5,
+                  status_forcelist=[429, 500, 502, 503, 504],
+                  allowed_methods=["GET", "HEAD"], raise_on_status=False)
+    adapter = HTTPAdapter(pool_connections=max_workers * 2, pool_maxsize=per_host,
+                          max_retries=retry)
+    session = requests.Session()
+    session.headers.update(HEADERS)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+
+class Crawler:
+    """Scrape many sites at once, bounded by a global and a per-host fetch limit.
+
+    Requests to one host are spaced `delay` seconds apart (longer if its
+    robots.txt sets a Crawl-delay) and URLs robots.txt disallows are
+    skipped. In deep mode a site's likeliest contact pages are fetched one
+    after the other on the site's own thread, from a Frontier of at most
+    `max_subpages` pages, stopping as soon as an email turns up (unless
+    `stop_on_email` is off); throughput comes from crawling many hosts
+    side by side. With `discover`, the contact pages named in the site's
+    sitemap are tried before the homepage.
+
+    Bodies are streamed: responses that aren't HTML are dropped after the
+    headers and pages are cut off after `max_bytes`, which the "skipped"
+    and "truncated" stats count.
+    """
+
+    def __init__(self, max_workers=MAX_WORKERS, per_host=PER_HOST, timeout=10,
+                 max_subpages=3, on_error=None, cache=None, backend="regex",
+                 delay=HOST_DELAY, robots=True, max_depth=2, stop_on_email=True,
+                 discover=False, max_bytes=MAX_BYTES):
+        self.max_workers = max_workers
+        self.per_host = per_host
+        self.timeout = timeout
+        self.max_subpages = max_subpages
+        self.max_depth = max_depth
+        self.stop_on_email = stop_on_email
+        self.discover = discover
+        self.max_bytes = max_bytes
+        self.on_error = on_error
+        self.cache = cache
+        self.backend = backend
+        self.stats = Counter()
+        self._stats_lock = threading.Lock()
+        self._slots = threading.BoundedSemaphore(max_workers)
+        self._host_slots = defaultdict(lambda: threading.BoundedSemaphore(per_host))
+        self._host_lock = threading.Lock()
+        self._sites = ThreadPoolExecutor(max_workers, thread_name_prefix="crawl-site")
+        self.session = make_session(max_workers, per_host)
+        self.scheduler = HostScheduler(delay)
+        self.robots = RobotsCache(self._fetch_robots, HEADERS["User-Agent"]) if robots else None
+        # Sitemap pages per site when there's no ScrapeCache to keep them in
+        self._sitemaps = {}
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        self._sites.shutdown(wait=True, cancel_futures=True)
+        self.session.close()
+
+    def _host_slot(self, url):
+        host = urlparse(url).netloc.lower()
+        with self._host_lock:
+            return self._host_slots[host]
+
+    def _fetch_robots(self, url):
+        with self._slots:
+            response = self.session.get(url, timeout=self.timeout)
+            return response.status_code, response.text
+
+    def fetch(self, url, headers=None, types=PAGE_TYPES):
+        """GET a page politely, holding one global and one per-host slot.
+
+        Returns a Fetched with the body already read. Raises Disallowed if
+        robots.txt rules the URL out, and Skipped if the response's
+        Content-Type isn't one of `types` (None allows any).
+        The wait for the host's turn happens before taking a global slot,
+        so a throttled host never holds up the others.
+        """
+        delay = self.scheduler.delay
+        if self.robots:
+            if not self.robots.allowed(url):
+                self.count("robots_blocked")
+                raise Disallowed(f"{url} is disallowed by robots.txt")
+            delay = max(delay, self.robots.delay(url) or 0)
+        self.scheduler.wait(host_of(url), delay)
+        with self._slots, self._host_slot(url):
+            response = self.session.get(url, headers=headers, timeout=self.timeout, stream=True)
+            with response:
+                if response.status_code == 304:
+                    return Fetched(304, response.headers)
+                response.raise_for_status()
+                content_type = response.headers.get("Content-Type", "")
+                if types and content_type and not content_type.lower().startswith(types):
+                    self.count("skipped")
+                    raise Skipped(f"{url} is {content_type.split(';')[0]}, not a page")
+                return Fetched(response.status_code, response.headers, self._read(response),
+                               response.encoding)
+
+    def _read(self, response):
+        """The body, decompressed, cut off after max_bytes."""
+        body = bytearray()
+        for chunk in response.iter_content(CHUNK_SIZE):
+            body += chunk
+            if len(body) > self.max_bytes:
+                self.count("truncated")
+                return bytes(body[:self.max_bytes])
+        return bytes(body)
+
+    def count(self, key, n=1):
+        with self._stats_lock:
+            self.stats[key] += n
+
+    def scrape_page(self, url):
+        """Fetch a single page and return (emails, links) found on it."""
+        emails, links, _ = self._scrape(url)
+        return emails, links
+
+    def _scrape(self, url):
+        """(emails, links, anchor texts) for one page.
+
+        With a cache, fresh entries skip the network entirely and stale
+        ones are revalidated with a conditional GET.
+        """
+        cached = self.cache.get(url) if self.cache else None
+        if cached and self.cache.is_fresh(cached):
+            self.count("cache_hits")
+            return set(cached.emails), cached.links, cached.anchors
+
+        fetched = self.fetch(url, cached.validators() if cached else None)
+        if fetched.status_code == 304 and cached:
+            self.count("cache_revalidated")
+            self.cache.touch(url)
+            return set(cached.emails), cached.links, cached.anchors
+
+        self.count("cache_misses")
+        encoding = fetched.encoding or guess_encoding(fetched.content) or "utf-8"
+        # Separate text nodes so page text isn't glued onto addresses
+        emails, links, anchors = extract_page(fetched.content, encoding, self.backend,
+                                              separator=" ")
+        if self.cache:
+            self.cache.put(url, emails, links, fetched.headers.get("ETag"),
+                           fetched.headers.get("Last-Modified"), anchors)
+        return emails, links, anchors
+
+    def _scrape_subpage(self, url):
+        """Like _scrape, but errors are reported, and None means there's no such page."""
+        try:
+            return self._scrape(url)
+        except Skipped:
+            return set(), [], []
+        except Exception as e:
+            if status_of(e) in MISSING:
+                self.count("missing_pages")
+                return None
+            self._report(url, e)
+            return set(), [], []
+
+    def contact_pages(self, url):
+        """Likely contact pages on `url`'s site according to its sitemap.
+
+        Worked out once per site and kept in the ScrapeCache (or in memory
+        without one). A site without a sitemap has none: guessing paths
+        like /contact costs more fetches than walking the homepage's
+        links. A site that doesn't answer at all raises, so the caller
+        reports it without also trying its homepage.
+        """
+        site = site_key(url)
+        pages = self.cache.get_sitemap(site) if self.cache else self._sitemaps.get(site)
+        if pages is not None:
+            self.count("sitemap_hits")
+            return pages
+
+        parts = urlsplit(url)
+        root = f"{parts.scheme}://{parts.netloc}"
+        try:
+            pages = self._read_sitemap(root)
+        except Exception as e:
+            if status_of(e) is None and not isinstance(e, Disallowed):
+                raise
+            pages = None
+        if pages is None:
+            pages = []
+        else:
+            self.count("sitemaps_read")
+        self._keep_pages(site, pages)
+        return pages
+
+    def _keep_pages(self, site, pages):
+        if self.cache:
+            self.cache.put_sitemap(site, pages)
+        else:
+            self._sitemaps[site] = pages
+
+    def _read_sitemap(self, root):
+        """Contact pages listed in the site's sitemap, or None if it has none."""
+        urls = []
+        if self.robots:
+            parser = self.robots.rules(root)
+            urls = [u for u in (parser and parser.site_maps()) or [] if site_key(u) == site_key(root)]
+        sitemap = self.fetch(urls[0] if urls else root + "/sitemap.xml", types=None)
+        pages, children = parse_sitemap(sitemap.content)
+        for child in child_sitemaps(children):
+            try:
+                pages += parse_sitemap(self.fetch(child, types=None).content)[0]
+            except Exception:
+                pass
+        if not pages and not children:
+            return None
+        return contact_pages(pages, root)
+
+    def _walk(self, frontier, emails, links):
+        """Fetch pages off the frontier until it runs out or an email turns up.
+
+        Emails and links found are added to `emails` and `links`. Returns
+        the URLs that turned out not to exist; they count against the
+        frontier's budget like any other page.
+        """
+        missing = []
+        while not (emails and self.stop_on_email):
+            page = frontier.pop()
+            if page is None:
+                break
+            page_url, depth = page
+            self.count("subpages")
+            scraped = self._scrape_subpage(page_url)
+            if scraped is None:
+                missing.append(page_url)
+                continue
+            found, page_links, anchors = scraped
+            emails.update(found)
+            links.extend(urljoin(page_url, l) for l in page_links)
+            frontier.add(page_url, page_links, anchors, depth + 1)
+        return missing
+
+    def scrape_website(self, url, deep=False):
+        """Fetch a page and extract emails + links, optionally follow contact pages.
+
+        The links are those on every page fetched for the site, resolved
+        against their page, homepage first. In deep mode with discovery
+        on, the contact pages in the site's sitemap are fetched first and
+        the homepage only if they turn up no email.
+        """
+        emails, links, _ = self._scrape_site(url, deep)
+        return emails, links
+
+    def _scrape_site(self, url, deep):
+        """scrape_website's (emails, links), plus the error if the site couldn't be read."""
+        emails, links = set(), []
+        frontier = Frontier(url, self.max_subpages, self.max_depth)
+        if deep and self.discover:
+            try:
+                pages = self.contact_pages(url)
+            except Exception as e:
+                self._report(url, e)
+                return [], [], e
+            frontier.add(url, pages, [""] * len(pages))
+            missing = self._walk(frontier, emails, links)
+            if missing:
+                # The sitemap is out of date; don't try these again next time
+                self._keep_pages(site_key(url), [p for p in pages if p not in missing])
+            if emails and self.stop_on_email:
+                return list(emails), unique(links), None
+
+        try:
+            found, home_links, anchors = self._scrape(url)
+        except Exception as e:
+            self._report(url, e)
+            # Emails from the sitemap's pages still make it a result
+            return list(emails), unique(links), None if emails else e
+        emails.update(found)
+        links[:0] = [urljoin(url, l) for l in home_links]
+
+        if deep:
+            frontier.add(url, home_links, anchors)
+            self._walk(frontier, emails, links)
+
+        return list(emails), unique(links), None
+
+    def scrape_hit(self, hit, deep=True):
+        """Turn one search hit into the agency dict used across the app.
+
+        "error" holds why the site couldn't be scraped (None if it was), so
+        an unreachable site isn't mistaken for one without addresses.
+        """
+        url = hit.get("href")
+        emails, links, error = self._scrape_site(url, deep)
+        return {
+            "title": hit.get("title", ""),
+            "url": url,
+            "emails": emails,
+            "links": links,
+            "error": str(error) if error else None
+        }
+
+    def crawl(self, results, deep=True, ordered=False):
+        """Scrape every search hit concurrently and yield agency dicts.
+
+        `results` may be a lazy iterable: each hit is handed to the pool as
+        soon as it arrives, and dicts are yielded as sites finish (or in
+        search order if `ordered`, which waits for the search to complete).
+        """
+        if ordered:
+            futures = [self._sites.submit(self.scrape_hit, r, deep) for r in results]
+            for future in futures:
+                yield future.result()
+            return
+
+        done = queue.Queue()
+        threading.Thread(target=self._feed, args=(results, deep, done), daemon=True).start()
+        total, yielded = None, 0
+        while total is None or yielded < total:
+            item = done.get()
+            if isinstance(item, Exception):
+                raise item
+            if isinstance(item, int):
+                total = item
+                continue
+            yielded += 1
+            yield item.result()
+
+    def _feed(self, results, deep, done):
+        """Submit hits as the search produces them, then post the total."""
+        submitted = 0
+        try:
+            for r in results:
+                self._sites.submit(self.scrape_hit, r, deep).add_done_callback(done.put)
+                submitted += 1
+        except Exception as e:
+            done.put(e)
+        done.put(submitted)
+
+    def _report(self, url, error):
+        if self.on_error:
+            self.on_error(url, error)
+
+
+def status_of(error):
+    """The HTTP status behind a failed fetch, or None if the server never answered."""
+    response = getattr(error, "response", None)
+    return getattr(response, "status_code", None)
+
+
+def guess_encoding(content):
+    """The charset detected from the body, as requests' apparent_encoding would give."""
+    from requests.compat import chardet
+
+    return chardet.detect(content)["encoding"] if chardet else None
+
+
+def unique(items):
+    return list(dict.fromkeys(items))
@@ -0,0 +1,129 @@
+import os
+import re
+from functools import lru_cache
+
+from mx_resolver import MXResolver
+
+TLD_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "tlds.txt")
+
+# Role mailboxes that scraped text tends to glue other words onto,
+# e.g. "Usinfo@" from "Contact Us" + "info@" or "7321info@" from a phone number
+ROLE_NAMES = ["enquiries", "enquiry", "info", "hello", "contact", "sales", "office",
+              "admin", "support", "bookings", "accounts", "careers", "jobs", "team", "mail"]
+# RFC 2606 names that only ever appear as placeholders
+RESERVED_DOMAINS = {"example.com", "example.org", "example.net"}
+
+LOCAL_RE = re.compile(r"[a-z0-9!#$%&'*+/=?^_`{|}~-]+(?:\.[a-z0-9!#$%&'*+/=?^_`{|}~-]+)*")
+LABEL_RE = re.compile(r"[a-z0-9](?:[a-z0-9-]{0,61}[a-z0-9])?")
+CASE_BOUNDARY_RE = re.compile(r"(?<=[a-z])(?=[A-Z])")
+# Cells in exported CSVs hold several addresses separated like this
+SEPARATOR_RE = re.compile(r"[;,\s]+")
+GLUED_ROLE_RE = re.compile(r"^(?P<glue>.*?(?:[A-Z].*|\d+))(?P<role>%s)$" % "|".join(ROLE_NAMES))
+# Glue that is certainly page text rather than part of the mailbox name:
+# the tail of a phone number, or a label such as "Email:" or "Contact us"
+PAGE_GLUE_RE = re.compile(r"\+?\d[\d-]{3,}|e-?mail|mail|tel|contact|contactus|us",
+                          re.IGNORECASE)
+
+
+@lru_cache(maxsize=None)
+def load_tlds(path=TLD_FILE):
+    """The set of known top-level domains, one per line in `path`."""
+    with open(path, encoding="utf-8") as f:
+        return frozenset(line.strip().lower() for line in f
+                         if line.strip() and not line.startswith("#"))
+
+
+def _repair_tld(label, tlds):
+    """Cut text glued onto the last domain label, e.g. "comSocials" or "cominfo".
+
+    Lower-case glue is only cut off when it is a word of 3+ letters, so
+    file names like "logo@2x.png" are rejected rather than "repaired".
+    """
+    label = CASE_BOUNDARY_RE.split(label, 1)[0].lower()
+    if label in tlds:
+        return label
+    for end in range(len(label) - 3, 1, -1):
+        if label[:end] in tlds:
+            return label[:end]
+    return None
+
+
+def normalize_email(raw, tlds=None, scraped=False):
+    """Case-fold one address, or return None if it isn't one.
+
+    The TLD must be on the suffix list. With `scraped`, the address came
+    out of page text, so page text glued onto either side of it is cut
+    off: a role mailbox is only split from its prefix when the prefix is
+    a phone number or a label like "Email", and one that merely looks
+    glued ("Salesteam@") is dropped rather than rewritten to another
+    mailbox. Addresses people typed in are never rewritten.
+    """
+    tlds = tlds or load_tlds()
+    email = str(raw).strip().strip("<>()[]\"',;:.")
+    if email[:7].lower() == "mailto:":
+        email = email[7:]
+    if email.count("@") != 1:
+        return None
+    local, domain = email.split("@")
+
+    labels = domain.split(".")
+    if scraped:
+        glued = GLUED_ROLE_RE.match(local)
+        if glued:
+            if not PAGE_GLUE_RE.fullmatch(glued.group("glue")):
+                return None
+            local = glued.group("role")
+        labels[-1] = _repair_tld(labels[-1], tlds)
+    elif labels[-1].lower() not in tlds:
+        return None
+    if labels[-1] is None:
+        return None
+
+    local = local.lower()
+    labels = [label.lower() for label in labels]
+    domain = ".".join(labels)
+    if len(local) > 64 or len(domain) > 253 or len(labels) < 2:
+        return None
+    if not LOCAL_RE.fullmatch(local) or not all(LABEL_RE.fullmatch(l) for l in labels):
+        return None
+    if domain in RESERVED_DOMAINS:
+        return None
+    return f"{local}@{domain}"
+
+
+_resolver = None
+
+
+def default_resolver():
+    """One MXResolver per process, so its cache outlives a single list."""
+    global _resolver
+    if _resolver is None:
+        _resolver = MXResolver()
+    return _resolver
+
+
+def iter_valid_emails(cells, scraped=False):
+    """Normalise and dedupe a stream of cells, yielding each new address once.
+
+    Each cell may hold several addresses, e.g. a "a@x.com; b@y.com" cell.
+    Only the set of addresses seen so far is kept in memory.
+    """
+    tlds = load_tlds()
+    seen = set()
+    for cell in cells:
+        for raw in SEPARATOR_RE.split(str(cell)):
+            email = normalize_email(raw, tlds, scraped) if raw else None
+            if email and email not in seen:
+                seen.add(email)
+                yield email
+
+
+def validate_emails(emails, check_mx=False, resolver=None, scraped=False):
+    """Normalise, dedupe (keeping first-seen order) and optionally DNS-check addresses.
+
+    Pass `scraped` for addresses extracted from web pages; see normalize_email.
+    """
+    valid = list(iter_valid_emails(emails, scraped))
+    if check_mx and valid:
+        valid, _ = (resolver or default_resolver()).partition(valid)
+    return valid
@@ -0,0 +1,136 @@
+import codecs
+import html
+import re
+from importlib.util import find_spec
+from urllib.parse import unquote
+
+# The optional parsers are only imported once their backend is used
+LXML_AVAILABLE = find_spec("lxml") is not None
+SELECTOLAX_AVAILABLE = find_spec("selectolax") is not None
+
+EMAIL_RE = re.compile(r"[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}")
+
+# A tag, allowing '>' inside quoted attribute values
+_TAG = rb"""(?:"[^"]*"|'[^']*'|[^'">])*"""
+# One alternation walks the whole document: comments and script/style/
+# template bodies are skipped, CDATA is kept as text, anchors are captured
+# for their href (and closed, to get their text) and every other tag is dropped.
+_TOKENS = re.compile(
+    rb"<!--.*?(?:-->|$)"
+    rb"|<!\[CDATA\[(?P<cdata>.*?)(?:\]\]>|$)"
+    rb"|<(?P<skip>script|style|template)\b" + _TAG + rb">.*?(?:</(?P=skip)\s*>|$)"
+    rb"|(?P<anchor><a\s" + _TAG + rb">)"
+    rb"|(?P<close></a\s*>)"
+    rb"|<[/!?]?[a-zA-Z]" + _TAG + rb">"
+    rb"|<[!?]" + _TAG + rb">",
+    re.IGNORECASE | re.DOTALL
+)
+_HREF = re.compile(rb"""\shref\s*=\s*(?:"([^"]*)"|'([^']*)'|([^\s>]+))""", re.IGNORECASE)
+
+BACKENDS = ["regex"] + (["lxml"] if LXML_AVAILABLE else []) + (["selectolax"] if SELECTOLAX_AVAILABLE else [])
+
+
+def _extract_regex(content, encoding, separator):
+    chunks, hrefs, texts = [], [], []
+    pos = 0
+    # The link whose text is being collected and where its text starts in `chunks`
+    open_link = None
+    for m in _TOKENS.finditer(content):
+        chunks.append(content[pos:m.start()])
+        pos = m.end()
+        if m.group("cdata") is not None:
+            chunks.append(m.group("cdata"))
+        elif m.group("anchor") is not None or m.group("close") is not None:
+            if open_link is not None:
+                texts[open_link[0]] = b" ".join(chunks[open_link[1]:])
+                open_link = None
+            href = _HREF.search(m.group("anchor") or b"")
+            if href:
+                hrefs.append(href.group(1) or href.group(2) or href.group(3) or b"")
+                texts.append(b"")
+                open_link = (len(hrefs) - 1, len(chunks))
+    chunks.append(content[pos:])
+
+    sep = separator.encode("ascii")
+    text = sep.join(c for c in chunks if c).decode(encoding, "replace")
+    links = [h.decode(encoding, "replace") for h in hrefs]
+    if "&" in text:
+        text = html.unescape(text)
+    links = [html.unescape(l) if "&" in l else l for l in links]
+    return text, links, [_anchor_text(t, encoding) for t in texts]
+
+
+def _anchor_text(raw, encoding):
+    text = " ".join(raw.decode(encoding, "replace").split())
+    return html.unescape(text) if "&" in text else text
+
+
+# lxml and selectolax parse like browsers do, so CDATA sections in HTML are
+# dropped as comments instead of kept as text the way html.parser keeps them.
+def _extract_lxml(content, encoding, separator):
+    import lxml.html
+    from lxml import etree
+
+    parser = lxml.html.HTMLParser(encoding=encoding)
+    doc = lxml.html.document_fromstring(content, parser=parser)
+    etree.strip_elements(doc, "script", "style", "template", etree.Comment, with_tail=False)
+    text = separator.join(doc.itertext())
+    anchors = doc.xpath("//a[@href]")
+    return (text, [str(a.get("href")) for a in anchors],
+            [" ".join(a.text_content().split()) for a in anchors])
+
+
+def _extract_selectolax(content, encoding, separator):
+    from selectolax.parser import HTMLParser
+
+    tree = HTMLParser(content.decode(encoding, "replace"))
+    tree.strip_tags(["script", "style", "template"])
+    text = tree.root.text(separator=separator) if tree.root else ""
+    anchors = tree.css("a[href]")
+    return (text, [a.attributes.get("href") or "" for a in anchors],
+            [" ".join(a.text(separator=" ").split()) for a in anchors])
+
+
+_BACKENDS = {
+    "regex": _extract_regex,
+    "lxml": _extract_lxml,
+    "selectolax": _extract_selectolax,
+}
+
+
+def mailto_addresses(links):
+    """Addresses named in mailto: links, without any ?subject=... part."""
+    for link in links:
+        if link[:7].lower() == "mailto:":
+            for address in unquote(link[7:].split("?", 1)[0]).split(","):
+                address = address.strip()
+                if EMAIL_RE.fullmatch(address):
+                    yield address
+
+
+def _known_encoding(encoding):
+    """`encoding`, or utf-8 if it's missing or a charset Python doesn't know."""
+    try:
+        codecs.lookup(encoding or "utf-8")
+    except LookupError:
+        return "utf-8"
+    return encoding or "utf-8"
+
+
+def extract(content, encoding="utf-8", backend="regex", separator=""):
+    """Pull emails and hrefs out of raw page bytes in a single pass.
+
+    Finds the same visible-text emails and links as
+    BeautifulSoup(...).get_text() / find_all("a", href=True), plus the
+    targets of mailto: links. `separator` is placed between text nodes.
+    """
+    emails, links, _ = extract_page(content, encoding, backend, separator)
+    return emails, links
+
+
+def extract_page(content, encoding="utf-8", backend="regex", separator=""):
+    """Like extract, but also returns each link's anchor text (same order as links)."""
+    text, links, texts = _BACKENDS[backend](content, _known_encoding(encoding), separator)
+    emails = set(EMAIL_RE.findall(text))
+    emails.update(mailto_addresses(links))
+    return emails, links, texts
@@ -0,0 +1,88 @@
+import heapq
+import re
+from urllib.parse import urljoin, urlsplit
+
+from urls import canonical_url, site_key
+
+# Words that suggest a page lists contact details, by how strongly they do.
+# Matched against anchor text (which counts double) and the URL path.
+LINK_WORDS = {
+    "contact": 10, "kontakt": 10, "get-in-touch": 9, "get in touch": 9, "enquir": 8,
+    "email": 8, "e-mail": 8, "impressum": 8, "imprint": 8, "reach-us": 5, "reach us": 5,
+    "about": 5, "team": 5, "people": 4, "staff": 4, "office": 3, "location": 3, "support": 3,
+    "find-us": 5, "find us": 5,
+}
+# Pages that are almost never where an agency's address is
+SKIP_WORDS = ["blog", "news", "article", "tag/", "category", "login", "cart", "checkout",
+              "privacy", "cookie", "terms", "feed", "wp-json", "wp-content", "/search"]
+SKIP_EXTENSIONS = (".pdf", ".jpg", ".jpeg", ".png", ".gif", ".svg", ".webp", ".zip",
+                   ".doc", ".docx", ".xls", ".xlsx", ".mp4", ".mp3", ".css", ".js", ".xml")
+NOT_PAGES = ("mailto:", "tel:", "javascript:", "data:", "#")
+
+WORD_RE = re.compile("|".join(re.escape(w) for w in sorted(LINK_WORDS, key=len, reverse=True)))
+
+
+def score_link(url, text=""):
+    """How likely the page at `url`, linked as `text`, is to hold an email.
+
+    0 means not worth a fetch. Anchor text counts double, since "Get in
+    touch" is a better sign than whatever the page happens to be called;
+    shallow paths win ties.
+    """
+    path = urlsplit(url).path.lower()
+    if path.endswith(SKIP_EXTENSIONS) or any(word in path for word in SKIP_WORDS):
+        return 0
+    text = text.lower()
+    if "@" in text:
+        return 20
+    score = sum(2 * LINK_WORDS[w] for w in set(WORD_RE.findall(text)))
+    score += sum(LINK_WORDS[w] for w in set(WORD_RE.findall(path)))
+    if score:
+        score -= path.strip("/").count("/")
+    return max(score, 0)
+
+
+class Frontier:
+    """Candidate pages on one site, best first, for a fixed fetch budget.
+
+    Links are resolved, canonicalised and deduplicated (so "/contact/",
+    "/contact#form" and "/contact?utm_source=x" are one page), and only
+    pages on the same site with a positive score are kept. `pop()` hands
+    out at most `budget` pages, and links found on a page are only added
+    up to `max_depth` hops from the homepage.
+    """
+
+    def __init__(self, root_url, budget=3, max_depth=2):
+        self.site = site_key(root_url)
+        self.budget = budget
+        self.max_depth = max_depth
+        self.seen = {canonical_url(root_url)}
+        self._heap = []
+        self._order = 0
+
+    def add(self, page_url, links, texts, depth=1):
+        """Queue the links found on `page_url`, which is `depth - 1` hops from home."""
+        if depth > self.max_depth:
+            return
+        for href, text in zip(links, texts):
+            if not href or href.lower().startswith(NOT_PAGES):
+                continue
+            url = canonical_url(urljoin(page_url, href))
+            if not url or url in self.seen or site_key(url) != self.site:
+                continue
+            self.seen.add(url)
+            score = score_link(url, text)
+            if score > 0:
+                heapq.heappush(self._heap, (-score, self._order, url, depth))
+                self._order += 1
+
+    def pop(self):
+        """The next (url, depth) to fetch, or None once the budget or queue runs out."""
+        if self.budget <= 0 or not self._heap:
+            return None
+        self.budget -= 1
+        _, _, url, depth = heapq.heappop(self._heap)
+        return url, depth
+
+    def __len__(self):
+        return len(self._heap)
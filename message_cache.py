@@ -0,0 +1,39 @@
+import re
+from email.header import Header
+from email.mime.multipart import MIMEMultipart
+from email.mime.text import MIMEText
+
+CRLF = b"\r\n"
+# What smtplib.sendmail does to a str message's line endings
+EOL_RE = re.compile(r"(?:\r\n|\n|\r(?!\n))")
+
+
+class MessageTemplate:
+    """A bulk email serialised once, with only the To: header added per recipient.
+
+    The headers and MIME body are rendered to wire-format bytes up front, so
+    `render` is a couple of byte concatenations and nothing is kept per
+    recipient. The message is rendered with `as_string()` (the compat32
+    policy) and given CRLF line endings the way sendmail does, so apart
+    from the MIME boundary the bytes match what building a MIMEMultipart
+    per recipient and sending `as_string()` put on the wire.
+    """
+
+    def __init__(self, sender, subject, plain_text):
+        msg = MIMEMultipart()
+        msg['Subject'] = subject
+        msg['From'] = sender
+        msg.attach(MIMEText(plain_text, 'plain'))
+
+        wire = EOL_RE.sub("\r\n", msg.as_string()).encode("ascii")
+        headers, body = wire.split(CRLF + CRLF, 1)
+        self._head = headers + CRLF + b"To: "
+        self._tail = CRLF + CRLF + body
+
+    def render(self, recipient):
+        """Wire-format bytes for one recipient, ready for sendmail."""
+        try:
+            to = recipient.encode("ascii")
+        except UnicodeEncodeError:
+            to = Header(recipient, "utf-8").encode().encode("ascii")
+        return self._head + to + self._tail
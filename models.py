@@ -0,0 +1,238 @@
+import re
+from array import array
+from bisect import bisect_right
+
+from PySide6.QtCore import (Qt, QAbstractListModel, QAbstractTableModel, QModelIndex,
+                            QSortFilterProxyModel, Signal)
+from PySide6.QtGui import QColor
+
+PENDING, SENT, FAILED = 0, 1, 2
+STATUS_NAMES = {PENDING: "pending", SENT: "sent", FAILED: "failed"}
+STATUS_COLORS = {SENT: QColor("#16A34A"), FAILED: QColor("#DC2626")}
+
+
+class RecipientListModel(QAbstractListModel):
+    """Recipient addresses with a per-row send status, for a QListView.
+
+    Addresses live back to back in one bytearray with an offsets array and
+    a one-byte status per row, so 100k+ recipients cost a few MB instead
+    of a text document. Filtering is a regex scan over that buffer, and
+    the address -> row index is only built when statuses start arriving.
+    """
+
+    # Statuses change for filtered-out rows too, which dataChanged can't report
+    counts_changed = Signal()
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._clear()
+
+    def _clear(self):
+        self._blob = bytearray()
+        self._offsets = array('L', [0])
+        self._status = array('B')
+        self._errors = {}
+        self._counts = [0, 0, 0]
+        self._index = None
+        self._visible = None
+        self._filter = ""
+
+    # --- Qt model interface -------------------------------------------------
+
+    def rowCount(self, parent=QModelIndex()):
+        if parent.isValid():
+            return 0
+        return len(self._status) if self._visible is None else len(self._visible)
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid():
+            return None
+        row = self._row(index.row())
+        if role == Qt.ItemDataRole.DisplayRole:
+            return self.email(row)
+        if role == Qt.ItemDataRole.ForegroundRole:
+            return STATUS_COLORS.get(self._status[row])
+        if role == Qt.ItemDataRole.ToolTipRole:
+            status = self._status[row]
+            return self._errors.get(row, STATUS_NAMES[status].capitalize())
+        return None
+
+    # --- Addresses ----------------------------------------------------------
+
+    def _row(self, visible_row):
+        return visible_row if self._visible is None else self._visible[visible_row]
+
+    def email(self, row):
+        return self._blob[self._offsets[row]:self._offsets[row + 1] - 1].decode()
+
+    def emails(self, status=None):
+        """Every address in load order (or just those in `status`), ignoring the filter."""
+        if status is not None:
+            return [self.email(row) for row, s in enumerate(self._status) if s == status]
+        return self._blob.decode().split("\n")[:-1] if self._status else []
+
+    def __len__(self):
+        return len(self._status)
+
+    def clear(self):
+        self.beginResetModel()
+        self._clear()
+        self.endResetModel()
+
+    def set_emails(self, emails):
+        self.beginResetModel()
+        self._clear()
+        self._extend(emails)
+        self.endResetModel()
+
+    def append_emails(self, emails):
+        """Add addresses not already in the list; returns how many were new."""
+        index = self._ensure_index() if self._status else {}
+        new = [e for e in dict.fromkeys(emails) if e not in index]
+        if not new:
+            return 0
+        if self._visible is None:
+            first = len(self._status)
+            self.beginInsertRows(QModelIndex(), first, first + len(new) - 1)
+            self._extend(new)
+            self.endInsertRows()
+        else:
+            self._extend(new)
+            self.set_filter(self._filter)
+        return len(new)
+
+    def _extend(self, emails):
+        for email in emails:
+            if self._index is not None:
+                self._index[email] = len(self._status)
+            self._blob += email.encode() + b"\n"
+            self._offsets.append(len(self._blob))
+            self._status.append(PENDING)
+            self._counts[PENDING] += 1
+
+    def _ensure_index(self):
+        if self._index is None:
+            self._index = {email: row for row, email in enumerate(self.emails())}
+        return self._index
+
+    # --- Status -------------------------------------------------------------
+
+    def set_statuses(self, updates):
+        """Apply (email, status, message) updates with one dataChanged for the lot."""
+        index = self._ensure_index()
+        changed = []
+        for email, status, message in updates:
+            row = index.get(email)
+            if row is None:
+                continue
+            self._counts[self._status[row]] -= 1
+            self._counts[status] += 1
+            self._status[row] = status
+            if status == FAILED and message:
+                self._errors[row] = message
+            else:
+                self._errors.pop(row, None)
+            visible = row if self._visible is None else self._visible_row(row)
+            if visible is not None:
+                changed.append(visible)
+        if changed:
+            self.dataChanged.emit(self.index(min(changed)), self.index(max(changed)))
+        self.counts_changed.emit()
+
+    def counts(self):
+        """(total, pending, sent, failed), kept up to date without a scan."""
+        return (len(self._status), *self._counts)
+
+    # --- Filtering ----------------------------------------------------------
+
+    def set_filter(self, text):
+        """Show only addresses containing `text` (case-insensitive)."""
+        self.beginResetModel()
+        self._filter = text.strip().lower()
+        if not self._filter:
+            self._visible = None
+        else:
+            rows = array('L')
+            last = -1
+            for match in re.finditer(re.escape(self._filter.encode()), self._blob):
+                row = bisect_right(self._offsets, match.start()) - 1
+                if row != last:
+                    rows.append(row)
+                    last = row
+            self._visible = rows
+        self.endResetModel()
+
+    def _visible_row(self, row):
+        i = bisect_right(self._visible, row) - 1
+        return i if i >= 0 and self._visible[i] == row else None
+
+
+class AgencyTableModel(QAbstractTableModel):
+    """Scraped agencies (title, URL, emails), appended a batch at a time.
+
+    Each batch is one beginInsertRows/endInsertRows, so a view only lays
+    out the new rows instead of rebuilding per-cell widget items.
+    """
+
+    COLUMNS = ["Title", "URL", "Emails"]
+    SORT_ROLE = Qt.ItemDataRole.UserRole
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._agencies = []
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._agencies)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.COLUMNS)
+
+    def headerData(self, section, orientation, role=Qt.ItemDataRole.DisplayRole):
+        if orientation == Qt.Orientation.Horizontal and role == Qt.ItemDataRole.DisplayRole:
+            return self.COLUMNS[section]
+        return None
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid():
+            return None
+        agency = self._agencies[index.row()]
+        column = index.column()
+        if role == Qt.ItemDataRole.DisplayRole:
+            if column == 2:
+                return ", ".join(agency['emails']) if agency['emails'] else "None found"
+            return agency['title'] if column == 0 else agency['url']
+        if role == Qt.ItemDataRole.ToolTipRole and column == 2:
+            return "\n".join(agency['emails']) or None
+        if role == self.SORT_ROLE:
+            # Emails sort by how many were found, text columns case-insensitively
+            if column == 2:
+                return len(agency['emails'])
+            return (agency['title'] if column == 0 else agency['url']).lower()
+        return None
+
+    def agencies(self):
+        """Every scraped agency in the order it arrived."""
+        return list(self._agencies)
+
+    def append(self, agencies):
+        if not agencies:
+            return
+        first = len(self._agencies)
+        self.beginInsertRows(QModelIndex(), first, first + len(agencies) - 1)
+        self._agencies.extend(agencies)
+        self.endInsertRows()
+
+    def clear(self):
+        self.beginResetModel()
+        self._agencies = []
+        self.endResetModel()
+
+
+def agency_proxy(model, parent=None):
+    """A sort/filter proxy over `model` that matches text in any column."""
+    proxy = QSortFilterProxyModel(parent)
+    proxy.setSourceModel(model)
+    proxy.setSortRole(AgencyTableModel.SORT_ROLE)
+    proxy.setFilterKeyColumn(-1)
+    proxy.setFilterCaseSensitivity(Qt.CaseSensitivity.CaseInsensitive)
+    return proxy
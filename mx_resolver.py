@@ -0,0 +1,113 @@
+import socket
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+try:
+    import dns.exception
+    import dns.resolver
+    DNSPYTHON_AVAILABLE = True
+except ImportError:
+    DNSPYTHON_AVAILABLE = False
+
+DEFAULT_TTL = 3600
+# How long to remember that a domain doesn't exist, or that a lookup failed
+NEGATIVE_TTL = 600
+ERROR_TTL = 60
+
+_MISSING = object()
+
+
+class LookupFailed(Exception):
+    """A lookup that couldn't be answered (timeout, SERVFAIL), not a missing domain."""
+
+
+def system_lookup(domain):
+    """Mail hosts for a domain and how long the answer may be cached.
+
+    Uses MX records when dnspython is installed, falling back to the
+    domain's own address (the implicit MX of RFC 5321) when there are no
+    MX records or no dnspython. An empty host list means nothing accepts
+    mail there, which only a real NXDOMAIN (or null MX) proves; None means
+    it couldn't be told, e.g. a name with MX records but no address when
+    dnspython isn't installed.
+    """
+    if DNSPYTHON_AVAILABLE:
+        try:
+            answer = dns.resolver.resolve(domain, "MX", lifetime=5)
+            records = sorted(answer, key=lambda r: r.preference)
+            hosts = [str(r.exchange).rstrip(".") for r in records]
+            # A "0 ." record is the RFC 7505 null MX: the domain takes no mail
+            return [h for h in hosts if h], answer.rrset.ttl
+        except dns.resolver.NXDOMAIN:
+            return [], NEGATIVE_TTL
+        except dns.resolver.NoAnswer:
+            pass
+        except dns.exception.DNSException as e:
+            raise LookupFailed(str(e))
+
+    try:
+        socket.getaddrinfo(domain, 25, proto=socket.IPPROTO_TCP)
+        return [domain], DEFAULT_TTL
+    except socket.gaierror as e:
+        # No address says nothing about MX records getaddrinfo can't see
+        if e.errno in (socket.EAI_NONAME, getattr(socket, "EAI_NODATA", socket.EAI_NONAME)):
+            return None, NEGATIVE_TTL
+        raise LookupFailed(str(e))
+    except UnicodeError:
+        return None, NEGATIVE_TTL
+
+
+class MXResolver:
+    """Resolve each recipient domain once, concurrently, with TTL-based expiry.
+
+    `lookup(domain)` returns (mail hosts, ttl seconds); pass a stub in tests
+    instead of the default `system_lookup`. A lookup that raises is treated
+    as deliverable so a flaky resolver never drops real recipients, and is
+    retried after ERROR_TTL.
+    """
+
+    def __init__(self, lookup=system_lookup, max_workers=16, clock=time.monotonic):
+        self.lookup = lookup
+        self.max_workers = max_workers
+        self._clock = clock
+        self._cache = {}
+        self._lock = threading.Lock()
+
+    def _cached(self, domain):
+        with self._lock:
+            entry = self._cache.get(domain)
+        if entry and entry[1] > self._clock():
+            return entry[0]
+        return _MISSING
+
+    def _resolve(self, domain):
+        try:
+            hosts, ttl = self.lookup(domain)
+        except Exception:
+            hosts, ttl = None, ERROR_TTL
+        with self._lock:
+            self._cache[domain] = (hosts, self._clock() + ttl)
+        return hosts
+
+    def resolve_many(self, domains):
+        """Map each domain to its mail hosts ([] = none, None = unknown)."""
+        results, missing = {}, []
+        for domain in set(domains):
+            hosts = self._cached(domain)
+            if hosts is _MISSING:
+                missing.append(domain)
+            else:
+                results[domain] = hosts
+        if missing:
+            with ThreadPoolExecutor(min(self.max_workers, len(missing))) as pool:
+                results.update(zip(missing, pool.map(self._resolve, missing)))
+        return results
+
+    def partition(self, emails):
+        """Split addresses into (deliverable, undeliverable), keeping their order."""
+        hosts = self.resolve_many({e.rsplit("@", 1)[-1].lower() for e in emails})
+        dead = {domain for domain, found in hosts.items() if found == []}
+        deliverable = [e for e in emails if e.rsplit("@", 1)[-1].lower() not in dead]
+        undeliverable = [e for e in emails if e.rsplit("@", 1)[-1].lower() in dead]
+        return deliverable, undeliverable
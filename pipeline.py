@@ -0,0 +1,236 @@
+"""Headless search -> scrape -> validate -> send, for cron and servers.
+
+    python pipeline.py "landscaping agencies UK" --config campaign.json
+    python pipeline.py --queries-file cities.txt --config campaign.json
+
+The config file is JSON whose keys are the long option names with
+underscores, e.g. {"smtp_host": "...", "sender": "...", "subject": "...",
+"body_file": "pitch.txt"}; command-line options override it. The SMTP
+password can also come from the SMTP_PASSWORD environment variable.
+
+Several queries (arguments, or a file with one per line) are searched
+side by side and their hits merged into one crawl.
+
+Addresses are sent while the crawl is still running, and every result is
+recorded in the same SendQueue the GUI uses, so re-running a campaign
+only mails recipients that haven't been sent it yet. No Qt is imported.
+"""
+import argparse
+import csv
+import json
+import os
+import sys
+
+from crawler import MAX_WORKERS, PER_HOST, MAX_BYTES
+from politeness import HOST_DELAY
+from search import read_queries, SEARCH_WORKERS, REGION
+from search_cache import SEARCH_TTL
+from scrape_cache import CACHE_TTL
+from email_validation import validate_emails, default_resolver
+from send_queue import SendQueue, campaign_id
+from send_log import SendLog
+from workflow import (search_sites, scrape_sites, send_stream, send_async,
+                      SEND_QUEUE_PATH, SEND_LOG_PATH)
+
+
+def recipients(agencies, resolver=None, on_agency=None):
+    """Yield each new, valid address found across a stream of agencies."""
+    seen = set()
+    for agency in agencies:
+        if on_agency:
+            on_agency(agency)
+        emails = [e for e in validate_emails(agency["emails"], scraped=True) if e not in seen]
+        seen.update(emails)
+        if resolver and emails:
+            emails, dead = resolver.partition(emails)
+            for email in dead:
+                print(f"⚠️ Skipping {email}: domain has no mail server")
+        yield from emails
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(description="Find agencies, collect their emails and send a campaign.")
+    parser.add_argument("query", nargs="*", help="search queries")
+    parser.add_argument("--queries-file", help="file of search queries, one per line")
+    parser.add_argument("--config", help="JSON file of option defaults")
+
+    scraping = parser.add_argument_group("scraping")
+    scraping.add_argument("--max-results", type=int, default=30, help="hits per query")
+    scraping.add_argument("--search-workers", type=int, default=SEARCH_WORKERS,
+                          help="searches run at once")
+    scraping.add_argument("--region", default=REGION, help="search region, e.g. uk-en")
+    scraping.add_argument("--search-ttl", type=float, default=SEARCH_TTL / 3600,
+                          help="hours a search's results are reused (0 always searches)")
+    scraping.add_argument("--workers", type=int, default=MAX_WORKERS)
+    scraping.add_argument("--per-host", type=int, default=PER_HOST)
+    scraping.add_argument("--cache-ttl", type=float, default=CACHE_TTL / 3600,
+                          help="hours a cached page is used without revalidating")
+    scraping.add_argument("--delay", type=float, default=HOST_DELAY,
+                          help="seconds between requests to one site (robots.txt may ask for more)")
+    scraping.add_argument("--max-page-kb", type=int, default=MAX_BYTES // 1024,
+                          help="stop reading a page after this many KB")
+    scraping.add_argument("--shallow", action="store_true", help="don't follow contact pages")
+    scraping.add_argument("--sitemaps", action="store_true",
+                          help="try the contact pages in each site's sitemap before its homepage")
+    scraping.add_argument("--skip-known", action="store_true",
+                          help="leave out sites scraped in an earlier run")
+    scraping.add_argument("--csv", help="also write scraped agencies to this CSV file")
+    scraping.add_argument("--check-mx", action="store_true", help="skip domains without a mail server")
+
+    sending = parser.add_argument_group("sending")
+    sending.add_argument("--smtp-host")
+    sending.add_argument("--smtp-port", type=int, default=587)
+    sending.add_argument("--smtp-username")
+    sending.add_argument("--smtp-password", default=os.environ.get("SMTP_PASSWORD"))
+    sending.add_argument("--no-starttls", action="store_true")
+    sending.add_argument("--sender")
+    sending.add_argument("--subject")
+    sending.add_argument("--body", help="message text")
+    sending.add_argument("--body-file", help="read the message text from this file")
+    sending.add_argument("--engine", choices=["threads", "async"], default="threads")
+    sending.add_argument("--connections", type=int, default=1)
+    sending.add_argument("--per-second", type=float, default=1/3)
+    sending.add_argument("--per-hour", type=int)
+    sending.add_argument("--queue", default=SEND_QUEUE_PATH, help="SendQueue database")
+    sending.add_argument("--log", default=SEND_LOG_PATH, help="CSV file for per-recipient results")
+    sending.add_argument("--dry-run", action="store_true", help="collect recipients without sending")
+    return parser
+
+
+def parse_args(argv=None):
+    parser = build_parser()
+    args, _ = parser.parse_known_args(argv)
+    if args.config:
+        with open(args.config, encoding="utf-8") as f:
+            config = json.load(f)
+        unknown = set(config) - {a.dest for a in parser._actions}
+        if unknown:
+            parser.error(f"unknown keys in {args.config}: {', '.join(sorted(unknown))}")
+        parser.set_defaults(**config)
+    args = parser.parse_args(argv)
+
+    # A config may give one query as a string
+    if isinstance(args.query, str):
+        args.query = [args.query]
+    if args.queries_file:
+        with open(args.queries_file, encoding="utf-8") as f:
+            args.query = args.query + read_queries(f.read())
+    if not args.query:
+        parser.error("a search query is required "
+                     "(argument, --queries-file or \"query\" in the config)")
+    if args.body_file:
+        with open(args.body_file, encoding="utf-8") as f:
+            args.body = f.read()
+    if not args.dry_run:
+        missing = [name for name in ("smtp_host", "sender", "subject", "body")
+                   if not getattr(args, name)]
+        if missing:
+            parser.error("sending needs " + ", ".join("--" + m.replace("_", "-") for m in missing)
+                         + " (or --dry-run)")
+    return args
+
+
+def run(args):
+    def report_error(url, e):
+        print(f"❌ Could not scrape {url}: {e}")
+
+    def on_query(query, hits):
+        print(f"🔍 {query}: {len(hits)} hits")
+
+    def report_search_error(query, e):
+        print(f"❌ Search failed for {query}: {e}")
+
+    hits, search_stats = search_sites(args.query, args.max_results, args.search_workers,
+                                      on_query=on_query, on_error=report_search_error,
+                                      region=args.region, ttl=args.search_ttl * 3600)
+    if search_stats.get("search_hits"):
+        print(f"🗄️ {search_stats['search_hits']} of {len(args.query)} searches "
+              f"reused from the last {args.search_ttl:g} h")
+    print(f"🌍 {len(hits)} sites to scrape")
+
+    csv_file = open(args.csv, "w", newline="", encoding="utf-8") if args.csv else None
+    writer = csv.writer(csv_file) if csv_file else None
+    if writer:
+        writer.writerow(["Title", "URL", "Emails"])
+
+    def on_agency(agency):
+        print(f"🏢 {agency['title'][:60]} — {len(agency['emails'])} emails")
+        if writer:
+            writer.writerow([agency["title"], agency["url"],
+                             "; ".join(agency["emails"]) if agency["emails"] else "None found"])
+
+    stats = {}
+    agencies = scrape_sites(hits, args.workers, args.per_host, args.cache_ttl * 3600,
+                            deep=not args.shallow, on_error=report_error, delay=args.delay,
+                            skip_known=args.skip_known, max_bytes=args.max_page_kb * 1024,
+                            discover=args.sitemaps, stats=stats)
+    found = recipients(agencies, default_resolver() if args.check_mx else None, on_agency)
+
+    try:
+        if args.dry_run:
+            emails = list(found)
+            for email in emails:
+                print(f"📧 {email}")
+            print(f"\nSummary: {len(emails)} recipients found (dry run, nothing sent)")
+            return 0
+        return send(args, found)
+    finally:
+        agencies.close()
+        if stats.get("skipped") or stats.get("truncated"):
+            print(f"📄 Pages: {stats.get('skipped', 0)} skipped (not HTML), "
+                  f"{stats.get('truncated', 0)} truncated at {args.max_page_kb} KB")
+        sites = [stats.get(key, 0) for key in
+                 ("known_reused", "known_skipped", "known_refreshed", "duplicate_hits")]
+        if any(sites):
+            print(f"🗂️ Sites: {sites[0]} reused, {sites[1]} skipped, "
+                  f"{sites[2]} refreshed, {sites[3]} duplicate hits")
+        if csv_file:
+            csv_file.close()
+            print(f"💾 Results saved to {args.csv}")
+
+
+def send(args, found):
+    smtp_config = {
+        "host": args.smtp_host,
+        "port": args.smtp_port,
+        "username": args.smtp_username,
+        "password": args.smtp_password,
+        "starttls": not args.no_starttls,
+    }
+    campaign = campaign_id(args.sender, args.subject, args.body)
+
+    with SendQueue(args.queue, campaign) as send_queue, \
+            SendLog(path=args.log, campaign=campaign) as log:
+        already_sent = send_queue.sent()
+
+        def to_send():
+            for email in found:
+                if email in already_sent:
+                    print(f"⏭️ Already sent to {email}")
+                    continue
+                send_queue.add([email])
+                yield email
+
+        def on_result(email, success, message, code, latency):
+            send_queue.mark(email, success, message)
+            log.record(email, success, message, code, latency)
+            if success:
+                print(f"✓ Sent email to: {email}")
+            else:
+                print(f"✗ Error sending to {email}: {message}")
+
+        engine = send_async if args.engine == "async" else send_stream
+        engine(to_send(), smtp_config, args.sender, args.subject, args.body,
+               connections=args.connections, per_second=args.per_second,
+               per_hour=args.per_hour, on_result=on_result)
+
+        print(f"\nSummary: {log.successful} successful, {log.failed} failed")
+        return 1 if log.failed and not log.successful else 0
+
+
+def main(argv=None):
+    return run(parse_args(argv))
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,108 @@
+import threading
+import time
+from urllib.parse import urlsplit
+
+# Seconds between requests to the same host, unless robots.txt asks for more
+HOST_DELAY = 1.0
+# A Crawl-delay above this is capped rather than stalling the whole crawl
+MAX_CRAWL_DELAY = 10.0
+ROBOTS_TTL = 24 * 3600
+# How long to wait before asking again after robots.txt couldn't be fetched
+ERROR_TTL = 600
+
+
+class Disallowed(Exception):
+    """The site's robots.txt doesn't allow fetching this URL."""
+
+
+def host_of(url):
+    return urlsplit(url).netloc.lower()
+
+
+class HostScheduler:
+    """Space out requests to each host while other hosts carry on.
+
+    `wait(host)` books the host's next free slot and sleeps until it
+    comes round, so callers for one host are served in arrival order,
+    `delay` seconds apart, and never block callers for other hosts.
+    """
+
+    def __init__(self, delay=HOST_DELAY, clock=time.monotonic, sleep=time.sleep):
+        self.delay = delay
+        self._clock = clock
+        self._sleep = sleep
+        self._next = {}
+        self._lock = threading.Lock()
+
+    def wait(self, host, delay=None):
+        delay = self.delay if delay is None else delay
+        with self._lock:
+            now = self._clock()
+            start = max(now, self._next.get(host, now))
+            self._next[host] = start + delay
+        if start > now:
+            self._sleep(start - now)
+
+
+class RobotsCache:
+    """robots.txt rules per site, fetched once and kept for `ttl` seconds.
+
+    `fetch(url)` returns (status code, text). A missing robots.txt (4xx)
+    allows everything; so does one that can't be fetched (5xx, timeout),
+    but that is only remembered for ERROR_TTL. Threads asking about the
+    same site while its robots.txt is in flight wait for that one fetch.
+    """
+
+    def __init__(self, fetch, user_agent="*", ttl=ROBOTS_TTL, clock=time.monotonic):
+        self.fetch = fetch
+        self.user_agent = user_agent
+        self.ttl = ttl
+        self._clock = clock
+        self._rules = {}
+        self._locks = {}
+        self._lock = threading.Lock()
+
+    def _site(self, url):
+        parts = urlsplit(url)
+        return f"{parts.scheme}://{parts.netloc.lower()}"
+
+    def rules(self, url):
+        """The parsed robots.txt for `url`'s site, or None if anything goes."""
+        site = self._site(url)
+        with self._lock:
+            lock = self._locks.setdefault(site, threading.Lock())
+        with lock:
+            entry = self._rules.get(site)
+            if entry and entry[1] > self._clock():
+                return entry[0]
+            # Imported here: urllib.robotparser pulls in urllib.request and http.client,
+            # which the GUI shouldn't pay for just to read HOST_DELAY
+            from urllib.robotparser import RobotFileParser
+
+            parser, ttl = None, self.ttl
+            try:
+                status, text = self.fetch(site + "/robots.txt")
+                if status < 300:
+                    parser = RobotFileParser()
+                    parser.parse(text.splitlines())
+                elif status >= 500:
+                    ttl = ERROR_TTL
+            except Exception:
+                ttl = ERROR_TTL
+            self._rules[site] = (parser, self._clock() + ttl)
+            return parser
+
+    def allowed(self, url):
+        parser = self.rules(url)
+        return parser is None or parser.can_fetch(self.user_agent, url)
+
+    def delay(self, url):
+        """Seconds robots.txt asks between requests (Crawl-delay or Request-rate), or None."""
+        parser = self.rules(url)
+        if parser is None:
+            return None
+        delay = parser.crawl_delay(self.user_agent)
+        rate = parser.request_rate(self.user_agent)
+        if rate and rate.requests:
+            delay = max(delay or 0, rate.seconds / rate.requests)
+        return None if delay is None else min(float(delay), MAX_CRAWL_DELAY)
@@ -0,0 +1,106 @@
+import threading
+import time
+from collections import deque
+
+# SMTP replies providers use to say "slow down"
+RATE_LIMIT_CODES = [421, 450, 452]
+
+
+class TokenBucket:
+    """Thread-safe limiter shared by every sender connection.
+
+    A per-second bucket sets the pace, and with `per_hour` no more than
+    that many messages go out in any 3600 seconds, counted over a sliding
+    window of recent send times. When the server pushes back, `backoff`
+    halves the pace and pauses everyone for `cooldown` seconds; each
+    `success` then wins back a slice of the configured rate.
+    """
+
+    def __init__(self, per_second=1.0, per_hour=None, burst=1, cooldown=60,
+                 min_rate=0.01, clock=time.monotonic, sleep=time.sleep):
+        self.max_rate = per_second
+        self.rate = per_second
+        self.per_hour = per_hour
+        self.burst = burst
+        self.cooldown = cooldown
+        self.min_rate = min_rate
+        self._clock = clock
+        self._sleep = sleep
+        self._lock = threading.Lock()
+        self._tokens = burst
+        # Send times within the last hour, oldest first
+        self._sent = deque()
+        self._paused_until = 0
+        self._last = clock()
+
+    def _refill(self, now):
+        elapsed = now - self._last
+        self._last = now
+        self._tokens = min(self.burst, self._tokens + elapsed * self.rate)
+        while self._sent and self._sent[0] <= now - 3600:
+            self._sent.popleft()
+
+    def _wait_time(self, now):
+        """Seconds until a token is free in every bucket, or 0 to take one now."""
+        waits = [self._paused_until - now, (1 - self._tokens) / self.rate]
+        if self.per_hour and len(self._sent) >= self.per_hour:
+            waits.append(self._sent[0] + 3600 - now)
+        return max(waits)
+
+    def reserve(self):
+        """Take a token if one is free, otherwise return the seconds to wait."""
+        with self._lock:
+            now = self._clock()
+            self._refill(now)
+            wait = self._wait_time(now)
+            if wait <= 0:
+                self._tokens -= 1
+                if self.per_hour:
+                    self._sent.append(now)
+                return 0
+            return wait
+
+    def acquire(self):
+        """Block until the next message may be sent."""
+        while True:
+            wait = self.reserve()
+            if wait <= 0:
+                return
+            self._sleep(min(wait, 1.0))
+
+    def backoff(self):
+        """The server signalled a rate limit: halve the pace and pause."""
+        with self._lock:
+            self.rate = max(self.rate / 2, self.min_rate)
+            self._paused_until = self._clock() + self.cooldown
+
+    def success(self):
+        """Recover towards the configured rate after a clean send."""
+        with self._lock:
+            if self.rate < self.max_rate:
+                self.rate = min(self.max_rate, self.rate + self.max_rate / 20)
+
+
+def report_attempt(email, started, limiter, on_result=None, error=None, error_code=None):
+    """Feed one send's outcome to the rate limiter and `on_result`.
+
+    `on_result(email, success, message, code, latency)` gets the SMTP
+    reply code (looked up with `error_code(error)` on failure) and the
+    seconds since `started`. Both send engines report through here. An
+    error raised by `on_result` is printed rather than raised, so a
+    worker keeps draining its queue when the log or queue can't be written.
+    """
+    latency = time.monotonic() - started
+    if error is None:
+        limiter.success()
+        result = (email, True, "Success", 250, latency)
+    else:
+        code = error_code(error) if error_code else None
+        if code in RATE_LIMIT_CODES:
+            limiter.backoff()
+        result = (email, False, str(error), code, latency)
+    if on_result:
+        try:
+            on_result(*result)
+        except Exception as e:
+            print(f"⚠️ Could not record the result for {email}: {e}")
@@ -0,0 +1,92 @@
+import csv
+from itertools import chain
+
+from email_validation import iter_valid_emails
+
+
+def detect_email_column(header, first_row):
+    """Index of the email column: a header mentioning "email", else the first
+    column whose first value contains an "@". None if there isn't one."""
+    for i, name in enumerate(header):
+        if 'email' in str(name).lower():
+            return i
+    for i, value in enumerate(first_row or []):
+        if value is not None and '@' in str(value):
+            return i
+    return None
+
+
+def _column_index(header, first_row, column):
+    if column is None:
+        index = detect_email_column(header, first_row)
+        if index is None:
+            raise ValueError("No email column found in the file")
+        return index
+    if column not in header:
+        raise ValueError(f"Column '{column}' not found in the file")
+    return list(header).index(column)
+
+
+def iter_csv_cells(path, column=None):
+    """Yield the email column of a CSV one row at a time."""
+    with open(path, newline="", encoding="utf-8-sig") as f:
+        rows = csv.reader(f)
+        header = next(rows, [])
+        first = next(rows, None)
+        index = _column_index(header, first, column)
+        for row in chain([first] if first else [], rows):
+            if index < len(row) and row[index]:
+                yield row[index]
+
+
+def iter_xlsx_cells(path, column=None, sheet=0):
+    """Yield the email column of an .xlsx sheet, reading it in read-only mode."""
+    from openpyxl import load_workbook
+
+    wb = load_workbook(path, read_only=True, data_only=True)
+    try:
+        ws = wb.worksheets[sheet] if isinstance(sheet, int) else wb[sheet]
+        rows = ws.iter_rows(values_only=True)
+        header = next(rows, ())
+        first = next(rows, None)
+        index = _column_index(header, first, column)
+        if first and index < len(first) and first[index] is not None:
+            yield first[index]
+        # Only the email column is materialised from here on
+        for row in ws.iter_rows(min_row=3, min_col=index + 1, max_col=index + 1,
+                                values_only=True):
+            if row and row[0] is not None:
+                yield row[0]
+    finally:
+        wb.close()
+
+
+def iter_xls_cells(path, column=None, sheet=0):
+    """Yield the email column of a legacy .xls sheet (needs pandas + xlrd)."""
+    import pandas as pd
+
+    header = pd.read_excel(path, sheet_name=sheet, nrows=1)
+    first = header.iloc[0].tolist() if len(header) else None
+    index = _column_index(list(header.columns), first, column)
+    df = pd.read_excel(path, sheet_name=sheet, usecols=[index])
+    yield from df.iloc[:, 0].dropna()
+
+
+def iter_cells(path, column=None, sheet=0):
+    """Raw values of the email column, for any of the supported file types."""
+    lower = path.lower()
+    if lower.endswith('.csv'):
+        return iter_csv_cells(path, column)
+    if lower.endswith('.xls'):
+        return iter_xls_cells(path, column, sheet)
+    return iter_xlsx_cells(path, column, sheet)
+
+
+def iter_recipients(path, column=None, sheet=0):
+    """Stream valid, de-duplicated addresses from a spreadsheet in file order.
+
+    Only the detected (or named) email column is read; addresses are
+    yielded as they are found, so the result can feed a SendQueue without
+    holding the whole sheet in memory.
+    """
+    return iter_valid_emails(iter_cells(path, column, sheet))
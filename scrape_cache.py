@@ -0,0 +1,120 @@
+import json
+import sqlite3
+import threading
+import time
+
+CACHE_TTL = 7 * 24 * 3600
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS pages (
+    url TEXT PRIMARY KEY,
+    emails TEXT NOT NULL,
+    links TEXT NOT NULL,
+    etag TEXT,
+    last_modified TEXT,
+    fetched REAL NOT NULL,
+    anchors TEXT
+);
+CREATE TABLE IF NOT EXISTS sitemaps (
+    site TEXT PRIMARY KEY,
+    pages TEXT NOT NULL,
+    fetched REAL NOT NULL
+);
+"""
+
+
+class CachedPage:
+    def __init__(self, emails, links, etag, last_modified, fetched, anchors=None):
+        self.emails = emails
+        self.links = links
+        self.etag = etag
+        self.last_modified = last_modified
+        self.fetched = fetched
+        # Anchor text per link; pages cached before it was stored have none
+        self.anchors = anchors or [""] * len(links)
+
+    def validators(self):
+        """Request headers that let the server answer 304 Not Modified."""
+        headers = {}
+        if self.etag:
+            headers["If-None-Match"] = self.etag
+        if self.last_modified:
+            headers["If-Modified-Since"] = self.last_modified
+        return headers
+
+
+class ScrapeCache:
+    """On-disk cache of what was extracted from each URL.
+
+    Entries younger than `ttl` seconds are used as-is. Older ones are kept
+    for their ETag/Last-Modified validators so the next fetch can be a
+    conditional request. It also keeps, per site, the contact pages its
+    sitemap pointed to, so a sitemap is read once per `ttl`.
+    """
+
+    def __init__(self, path="scrape_cache.db", ttl=CACHE_TTL):
+        self.path = path
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self.db = sqlite3.connect(path, check_same_thread=False)
+        self.db.execute("PRAGMA journal_mode=WAL")
+        self.db.executescript(SCHEMA)
+        columns = [row[1] for row in self.db.execute("PRAGMA table_info(pages)")]
+        if "anchors" not in columns:
+            self.db.execute("ALTER TABLE pages ADD COLUMN anchors TEXT")
+        self.db.commit()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def get(self, url):
+        with self._lock:
+            row = self.db.execute(
+                "SELECT emails, links, etag, last_modified, fetched, anchors FROM pages WHERE url = ?",
+                (url,)
+            ).fetchone()
+        if row is None:
+            return None
+        emails, links, etag, last_modified, fetched, anchors = row
+        return CachedPage(set(json.loads(emails)), json.loads(links), etag, last_modified, fetched,
+                          json.loads(anchors) if anchors else None)
+
+    def is_fresh(self, page):
+        return time.time() - page.fetched < self.ttl
+
+    def put(self, url, emails, links, etag=None, last_modified=None, anchors=None):
+        with self._lock:
+            self.db.execute(
+                "INSERT OR REPLACE INTO pages VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (url, json.dumps(sorted(emails)), json.dumps(links), etag, last_modified,
+                 time.time(), json.dumps(anchors) if anchors is not None else None)
+            )
+            self.db.commit()
+
+    def get_sitemap(self, site):
+        """The contact pages found for `site` within the TTL, or None."""
+        with self._lock:
+            row = self.db.execute(
+                "SELECT pages, fetched FROM sitemaps WHERE site = ?", (site,)
+            ).fetchone()
+        if row is None or time.time() - row[1] >= self.ttl:
+            return None
+        return json.loads(row[0])
+
+    def put_sitemap(self, site, pages):
+        with self._lock:
+            self.db.execute("INSERT OR REPLACE INTO sitemaps VALUES (?, ?, ?)",
+                            (site, json.dumps(pages), time.time()))
+            self.db.commit()
+
+    def touch(self, url):
+        """The server confirmed the page is unchanged: restart its TTL."""
+        with self._lock:
+            self.db.execute("UPDATE pages SET fetched = ? WHERE url = ?", (time.time(), url))
+            self.db.commit()
+
+    def close(self):
+        self.db.close()
@@ -1,59 +1,38 @@
-from ddgs import DDGS
-import requests
-from bs4 import BeautifulSoup
-import re
-from urllib.parse import urljoin
 import csv
-def scrape_landscaping_agencies(query="landscaping agencies UK", max_results=30):
-    agencies = []
-    with DDGS() as ddgs:
-        results = ddgs.text(query, max_results=max_results)
-        for r in results:
-            url = r.get("href")
-            title = r.get("title", "")
-            
-            emails, links = scrape_website(url, deep=True)
-            agencies.append({
-                "title": title,
-                "url": url,
-                "emails": emails,
-                "links": links
-            })
+from crawler import Crawler, MAX_WORKERS, PER_HOST
+from scrape_cache import ScrapeCache
+from search import search_many
+from search_cache import SearchCache
+
+def scrape_landscaping_agencies(query="landscaping agencies UK", max_results=30,
+                                max_workers=MAX_WORKERS, per_host=PER_HOST):
+    """Search for one query or a list of them and scrape every site found.
+
+    With several queries the searches run side by side and a URL found by
+    more than one is scraped once. Searches made in the last few hours
+    are reused.
+    """
+    queries = [query] if isinstance(query, str) else query
+    with SearchCache() as search_cache:
+        results = search_many(queries, max_results, on_error=_report_search_error,
+                              cache=search_cache)
+    with ScrapeCache() as cache, \
+            Crawler(max_workers=max_workers, per_host=per_host, on_error=_report_error, cache=cache) as crawler:
+        agencies = list(crawler.crawl(results, deep=True, ordered=True))
+        hits = crawler.stats["cache_hits"] + crawler.stats["cache_revalidated"]
+        print(f"🗄️ Cache: {hits} hits, {crawler.stats['cache_misses']} misses")
     return agencies
 
+def _report_error(url, e):
+    print(f"❌ Could not scrape {url}: {e}")
+
+def _report_search_error(query, e):
+    print(f"❌ Search failed for {query}: {e}")
+
 def scrape_website(url, deep=False):
     """Fetch a page and extract emails + links, optionally follow contact pages."""
-    emails, links = [], []
-    try:
-        headers = {"User-Agent": "Mozilla/5.0"}
-        response = requests.get(url, headers=headers, timeout=10)
-        response.raise_for_status()
-        
-        soup = BeautifulSoup(response.text, "html.parser")
-        
-        # Extract emails from this page
-        text = soup.get_text()
-        emails = list(set(re.findall(r"[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}", text)))
-        
-        # Extract all links
-        links = [a["href"] for a in soup.find_all("a", href=True)]
-        
-        if deep:
-            # Filter links that likely lead to contact/about pages
-            important_links = [
-                l for l in links 
-                if any(word in l.lower() for word in ["contact", "about", "team", "support"])
-            ]
-            
-            for l in important_links[:3]:  # follow only first 3 to avoid spamming
-                full_url = urljoin(url, l)
-                sub_emails, _ = scrape_website(full_url, deep=False)
-                emails.extend(sub_emails)
-        
-    except Exception as e:
-        print(f"❌ Could not scrape {url}: {e}")
-    
-    return list(set(emails)), links
+    with Crawler(on_error=_report_error) as crawler:
+        return crawler.scrape_website(url, deep=deep)
 def save_to_csv(data, filename="agencies.csv"):
     """Save scraped results into a CSV file."""
     with open(filename, mode="w", newline="", encoding="utf-8") as file:
@@ -0,0 +1,75 @@
+from concurrent.futures import ThreadPoolExecutor
+
+from urls import canonical_url
+
+# DuckDuckGo rate-limits bursts, so only a few searches run at once
+SEARCH_WORKERS = 3
+# ddgs's own default
+REGION = "us-en"
+
+
+def search(query, max_results, region=REGION):
+    """Search hits for `query` as a list of {title, href} dicts."""
+    from ddgs import DDGS
+
+    with DDGS() as ddgs:
+        return list(ddgs.text(query, region=region, max_results=max_results))
+
+
+def read_queries(text):
+    """Queries from text with one per line; blank lines and # comments are ignored."""
+    queries = []
+    for line in text.splitlines():
+        line = line.split("#", 1)[0].strip()
+        if line and line not in queries:
+            queries.append(line)
+    return queries
+
+
+def search_many(queries, max_results, workers=SEARCH_WORKERS, on_query=None, on_error=None,
+                cache=None, region=REGION):
+    """Run several searches at once and merge their hits.
+
+    Hits come back in query order with each canonical URL once, so a
+    site found by several query variants is only crawled once. A query
+    that fails is passed to `on_error(query, error)` and the rest carry
+    on; if every query fails, the first error is raised.
+    `on_query(query, hits)` is called as each search completes. With a
+    SearchCache, recent searches are answered from it.
+    """
+    def run(query):
+        hits = cache.get(query, max_results, region) if cache else None
+        if hits is not None:
+            if on_query:
+                on_query(query, hits)
+            return hits
+        try:
+            hits = search(query, max_results, region)
+        except Exception as e:
+            if on_error:
+                on_error(query, e)
+            return e
+        if cache:
+            cache.put(query, max_results, region, hits)
+        if on_query:
+            on_query(query, hits)
+        return hits
+
+    if not queries:
+        return []
+    with ThreadPoolExecutor(min(workers, len(queries)), thread_name_prefix="search") as pool:
+        results = list(pool.map(run, queries))
+
+    errors = [r for r in results if isinstance(r, Exception)]
+    if len(errors) == len(results):
+        raise errors[0]
+    merged, seen = [], set()
+    for hits in results:
+        if isinstance(hits, Exception):
+            continue
+        for hit in hits:
+            url = canonical_url(hit.get("href") or "")
+            if url and url not in seen:
+                seen.add(url)
+                merged.append(hit)
+    return merged
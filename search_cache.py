@@ -0,0 +1,93 @@
+import json
+import sqlite3
+import threading
+import time
+from collections import Counter
+
+# Search results go stale much faster than the pages they point to
+SEARCH_TTL = 12 * 3600
+MAX_SEARCHES = 500
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS searches (
+    query TEXT NOT NULL,
+    max_results INTEGER NOT NULL,
+    region TEXT NOT NULL,
+    hits TEXT NOT NULL,
+    fetched REAL NOT NULL,
+    used REAL NOT NULL,
+    PRIMARY KEY (query, max_results, region)
+);
+"""
+
+
+def normalize_query(query):
+    """The form queries are stored under, so "Landscaping  UK" matches "landscaping uk"."""
+    return " ".join(query.lower().split())
+
+
+class SearchCache:
+    """On-disk cache of search hits keyed by (query, max_results, region).
+
+    Entries are used for `ttl` seconds. A search for fewer results than
+    a cached one is answered from it, so lowering "max results" never
+    searches again. Only the `max_entries` most recently used searches
+    are kept.
+    """
+
+    def __init__(self, path="search_cache.db", ttl=SEARCH_TTL, max_entries=MAX_SEARCHES):
+        self.path = path
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.stats = Counter()
+        self._lock = threading.Lock()
+        self.db = sqlite3.connect(path, check_same_thread=False)
+        self.db.execute("PRAGMA journal_mode=WAL")
+        self.db.executescript(SCHEMA)
+        self.db.commit()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def get(self, query, max_results, region):
+        """Cached hits for the search, or None if there are none within the TTL."""
+        key = normalize_query(query)
+        with self._lock:
+            row = self.db.execute(
+                "SELECT max_results, hits FROM searches "
+                "WHERE query = ? AND region = ? AND max_results >= ? AND fetched > ? "
+                "ORDER BY max_results LIMIT 1",
+                (key, region, max_results, time.time() - self.ttl)
+            ).fetchone()
+            if row is None:
+                self.stats["search_misses"] += 1
+                return None
+            self.db.execute(
+                "UPDATE searches SET used = ? WHERE query = ? AND max_results = ? AND region = ?",
+                (time.time(), key, row[0], region)
+            )
+            self.db.commit()
+            self.stats["search_hits"] += 1
+        return json.loads(row[1])[:max_results]
+
+    def put(self, query, max_results, region, hits):
+        now = time.time()
+        with self._lock:
+            self.db.execute(
+                "INSERT OR REPLACE INTO searches VALUES (?, ?, ?, ?, ?, ?)",
+                (normalize_query(query), max_results, region, json.dumps(hits), now, now)
+            )
+            # Drop expired searches, then the least recently used beyond the limit
+            self.db.execute("DELETE FROM searches WHERE fetched <= ?", (now - self.ttl,))
+            self.db.execute(
+                "DELETE FROM searches WHERE rowid NOT IN "
+                "(SELECT rowid FROM searches ORDER BY used DESC LIMIT ?)",
+                (self.max_entries,)
+            )
+            self.db.commit()
+
+    def close(self):
+        self.db.close()
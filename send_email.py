@@ -1,7 +1,11 @@
 import smtplib
-import pandas as pd
-import time
+import sys
+import asyncio
 from datetime import datetime
+from smtp_pool import SMTPConnectionPool
+from rate_limit import TokenBucket, RATE_LIMIT_CODES
+from async_sender import send_campaign
+from recipients import iter_recipients
 
 def read_emails_from_excel(file_path, sheet_name=0, email_column='Email_Address'):
     """
@@ -16,18 +20,9 @@ def read_emails_from_excel(file_path, sheet_name=0, email_column='Email_Address'
     list: List of email addresses
     """
     try:
-        # Read the Excel file
-        df = pd.read_excel(file_path, sheet_name=sheet_name)
-        
-        # Check if the email column exists
-        if email_column not in df.columns:
-            raise ValueError(f"Column '{email_column}' not found in the Excel file")
-        
-        # Extract email addresses and remove any NaN values
-        emails = df[email_column].dropna().tolist()
-        
-        # Remove duplicates and return
-        return list(set(emails))
+        # Stream just the email column, repairing, validating and deduping
+        # addresses while keeping the sheet's order
+        return list(iter_recipients(file_path, column=email_column, sheet=sheet_name))
     
     except FileNotFoundError:
         print(f"Error: File '{file_path}' not found.")
@@ -36,6 +31,20 @@ def read_emails_from_excel(file_path, sheet_name=0, email_column='Email_Address'
         print(f"Error reading Excel file: {e}")
         return []
 
+def send_async(email_list, smtp_config, sender, subject, body, connections=4, per_second=1/3):
+    """Send to every address with the asyncio engine, printing each result."""
+    def report(receiver, success, message, code, latency):
+        if success:
+            print(f"✓ Sent email to: {receiver}")
+        else:
+            print(f"✗ Error sending to {receiver}: {message}")
+    
+    successful_sends, failed_sends = asyncio.run(send_campaign(
+        email_list, smtp_config, sender, subject, body,
+        connections=connections, per_second=per_second, on_result=report
+    ))
+    print(f"\nSummary: {successful_sends} successful, {failed_sends} failed")
+
 def main():
     # Specify the path to your Excel file
     excel_file = "/home/kelechukwu/Documents/Business_outreach.xlsx"
@@ -56,9 +65,24 @@ def main():
     
     sender = "favourkaycee23@gmail.com"
     
+    if "--async" in sys.argv:
+        smtp_config = {
+            'host': MAILTRAP_HOST,
+            'port': MAILTRAP_PORT,
+            'username': MAILTRAP_USERNAME,
+            'password': MAILTRAP_PASSWORD
+        }
+        send_async(email_list, smtp_config, sender, "Hi Mailtrap Test",
+                   f"This is a test e-mail message sent at {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}.")
+        return
+    
     successful_sends = 0
     failed_sends = 0
     
+    pool = SMTPConnectionPool(MAILTRAP_HOST, MAILTRAP_PORT, MAILTRAP_USERNAME, MAILTRAP_PASSWORD)
+    # One email every 3 seconds to avoid rate limiting
+    limiter = TokenBucket(per_second=1/3)
+    
     for i, receiver in enumerate(email_list):
         try:
             message = f"""\
@@ -68,33 +92,29 @@ From: {sender}
 
 This is a test e-mail message sent at {datetime.now().strftime("%Y-%m-%d %H:%M:%S")}."""
 
-            with smtplib.SMTP(MAILTRAP_HOST, MAILTRAP_PORT) as server:
-                server.starttls()
-                server.login(MAILTRAP_USERNAME, MAILTRAP_PASSWORD)
-                server.sendmail(sender, receiver, message)
+            limiter.acquire()
+            pool.send(sender, receiver, message)
+            limiter.success()
             
             successful_sends += 1
             print(f"✓ Sent email {i+1}/{len(email_list)} to: {receiver}")
             
-            # Add delay between emails (2-5 seconds to avoid rate limiting)
-            time.sleep(3)
-            
         except smtplib.SMTPResponseException as e:
             error_code = e.smtp_code
             error_message = e.smtp_error
             print(f"✗ SMTP Error ({error_code}) for {receiver}: {error_message}")
             failed_sends += 1
             
-            # If we get a rate limit error, wait longer
-            if error_code in [421, 450, 452]:
-                print("Rate limit detected, waiting 60 seconds...")
-                time.sleep(60)
+            # If we get a rate limit error, slow down and pause
+            if error_code in RATE_LIMIT_CODES:
+                print(f"Rate limit detected, waiting {limiter.cooldown} seconds...")
+                limiter.backoff()
                 
         except Exception as e:
             print(f"✗ Error sending to {receiver}: {str(e)}")
             failed_sends += 1
-            time.sleep(5)  # Wait a bit longer on generic errors
     
+    pool.close()
     print(f"\nSummary: {successful_sends} successful, {failed_sends} failed")
 
 if __name__ == "__main__":
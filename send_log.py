@@ -0,0 +1,99 @@
+import csv
+import os
+import threading
+import time
+from collections import deque, namedtuple
+from datetime import datetime
+
+SendResult = namedtuple("SendResult", "time email success code latency message")
+
+LOG_FIELDS = ["time", "campaign", "email", "status", "code", "latency_ms", "message"]
+
+
+class SendLog:
+    """Per-recipient send outcomes, kept in a bounded ring buffer.
+
+    Sender threads call `record()`, which only appends under a lock; the
+    UI `drain()`s whatever arrived since it last looked, on its own timer,
+    instead of receiving a signal per message. When `path` is given,
+    results are appended to a CSV file in batches (every `flush_every`
+    results or `flush_interval` seconds) so failures can be reviewed or
+    retried after the app is closed.
+    """
+
+    def __init__(self, capacity=10000, path=None, campaign="", flush_every=200,
+                 flush_interval=2.0, clock=time.monotonic):
+        self.path = path
+        self.campaign = campaign
+        self.flush_every = flush_every
+        self.flush_interval = flush_interval
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._undrained = deque(maxlen=capacity)
+        self._unwritten = []
+        self._last_flush = clock()
+        self.started_at = clock()
+        self.successful = 0
+        self.failed = 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def record(self, email, success, message="", code=None, latency=None):
+        result = SendResult(time.time(), email, success, code, latency, message)
+        with self._lock:
+            self._undrained.append(result)
+            if success:
+                self.successful += 1
+            else:
+                self.failed += 1
+            if self.path:
+                self._unwritten.append(result)
+                due = (len(self._unwritten) >= self.flush_every
+                       or self._clock() - self._last_flush >= self.flush_interval)
+                if due:
+                    self._flush()
+
+    def drain(self):
+        """Results recorded since the last call, oldest first.
+
+        If more than `capacity` arrive between calls only the newest are
+        returned; the counters still include every result.
+        """
+        with self._lock:
+            results = list(self._undrained)
+            self._undrained.clear()
+        return results
+
+    def rate(self):
+        """Successful sends per minute since the log was created."""
+        elapsed = max(self._clock() - self.started_at, 1e-6)
+        return self.successful / elapsed * 60
+
+    def flush(self):
+        with self._lock:
+            self._flush()
+
+    def _flush(self):
+        if self._unwritten:
+            new_file = not os.path.exists(self.path)
+            with open(self.path, "a", newline="", encoding="utf-8") as f:
+                writer = csv.writer(f)
+                if new_file:
+                    writer.writerow(LOG_FIELDS)
+                writer.writerows(
+                    [datetime.fromtimestamp(r.time).isoformat(timespec="seconds"),
+                     self.campaign, r.email, "sent" if r.success else "failed",
+                     r.code or "", "" if r.latency is None else round(r.latency * 1000),
+                     r.message]
+                    for r in self._unwritten
+                )
+            self._unwritten = []
+        self._last_flush = self._clock()
+
+    def close(self):
+        if self.path:
+            self.flush()
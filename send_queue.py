@@ -0,0 +1,133 @@
+import hashlib
+import sqlite3
+import threading
+import time
+
+PENDING = "pending"
+SENT = "sent"
+FAILED = "failed"
+# Sends tried per recipient before "Retry Failed" leaves it alone
+MAX_ATTEMPTS = 3
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS recipients (
+    campaign TEXT NOT NULL,
+    email TEXT NOT NULL,
+    state TEXT NOT NULL DEFAULT 'pending',
+    attempts INTEGER NOT NULL DEFAULT 0,
+    error TEXT,
+    updated REAL,
+    PRIMARY KEY (campaign, email)
+)
+"""
+
+
+def campaign_id(sender_email, subject, plain_text):
+    """Stable id for a campaign, so the same send can be recognised after a restart."""
+    key = "\0".join([sender_email, subject, plain_text]).encode("utf-8")
+    return hashlib.sha1(key).hexdigest()[:16]
+
+
+class SendQueue:
+    """Crash-safe record of who in a campaign has been mailed.
+
+    Backed by SQLite in WAL mode. Results are buffered and committed in
+    batches (every `flush_every` results or `flush_interval` seconds), so
+    the sender never waits on a disk sync per message; after a crash at
+    most one unflushed batch can be sent again.
+    """
+
+    def __init__(self, path="send_queue.db", campaign="default", flush_every=50,
+                 flush_interval=1.0):
+        self.path = path
+        self.campaign = campaign
+        self.flush_every = flush_every
+        self.flush_interval = flush_interval
+        self._lock = threading.Lock()
+        self._buffer = []
+        self._last_flush = time.monotonic()
+        self.db = sqlite3.connect(path, check_same_thread=False)
+        self.db.execute("PRAGMA journal_mode=WAL")
+        self.db.execute("PRAGMA synchronous=NORMAL")
+        self.db.execute(SCHEMA)
+        self.db.commit()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def add(self, emails):
+        """Queue addresses; ones already known to this campaign keep their state."""
+        with self._lock:
+            self.db.executemany(
+                "INSERT OR IGNORE INTO recipients (campaign, email) VALUES (?, ?)",
+                ((self.campaign, email) for email in emails)
+            )
+            self.db.commit()
+
+    def pending(self, retry_failed=False, max_attempts=MAX_ATTEMPTS):
+        """Addresses still to send, in the order they were queued.
+
+        With `retry_failed`, failed addresses are included too, as long as
+        they have been tried fewer than `max_attempts` times.
+        """
+        states = [PENDING, FAILED] if retry_failed else [PENDING]
+        marks = ", ".join("?" * len(states))
+        with self._lock:
+            rows = self.db.execute(
+                f"SELECT email FROM recipients WHERE campaign = ? AND state IN ({marks}) "
+                "AND attempts < ? ORDER BY rowid",
+                (self.campaign, *states, max_attempts)
+            ).fetchall()
+        return [row[0] for row in rows]
+
+    def sent(self, emails=None):
+        """Addresses already sent, optionally restricted to `emails`."""
+        with self._lock:
+            rows = self.db.execute(
+                "SELECT email FROM recipients WHERE campaign = ? AND state = ?",
+                (self.campaign, SENT)
+            ).fetchall()
+        done = {row[0] for row in rows}
+        return done if emails is None else [e for e in emails if e in done]
+
+    def reset(self, emails):
+        """Put addresses back to pending, e.g. to deliberately send again."""
+        with self._lock:
+            self.db.executemany(
+                "UPDATE recipients SET state = ?, attempts = 0, error = NULL "
+                "WHERE campaign = ? AND email = ?",
+                ((PENDING, self.campaign, email) for email in emails)
+            )
+            self.db.commit()
+
+    def mark(self, email, success, error=None):
+        """Record one send attempt; written to disk with the next batch."""
+        with self._lock:
+            self._buffer.append((SENT if success else FAILED, None if success else error,
+                                 time.time(), self.campaign, email))
+            due = (len(self._buffer) >= self.flush_every
+                   or time.monotonic() - self._last_flush >= self.flush_interval)
+            if due:
+                self._flush()
+
+    def flush(self):
+        with self._lock:
+            self._flush()
+
+    def _flush(self):
+        if self._buffer:
+            self.db.executemany(
+                "UPDATE recipients SET state = ?, attempts = attempts + 1, error = ?, "
+                "updated = ? WHERE campaign = ? AND email = ?",
+                self._buffer
+            )
+            self.db.commit()
+            self._buffer = []
+        self._last_flush = time.monotonic()
+
+    def close(self):
+        self.flush()
+        self.db.close()
@@ -0,0 +1,106 @@
+import json
+import sqlite3
+import threading
+import time
+from collections import Counter
+
+from urls import canonical_url, site_key
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS sites (
+    site TEXT PRIMARY KEY,
+    url TEXT NOT NULL,
+    title TEXT NOT NULL,
+    emails TEXT NOT NULL,
+    scraped REAL NOT NULL
+);
+DROP TABLE IF EXISTS urls;
+"""
+
+
+class SiteIndex:
+    """Which sites have been scraped before, when, and what emails they had.
+
+    Keyed by site (host without "www."). Search hits are planned against
+    it: a site scraped less than `max_age` seconds ago is answered from
+    the index without any fetch, an older one is scraped again (cheaply,
+    since the page cache revalidates), and several hits on one site are
+    crawled once. Sites that couldn't be scraped aren't recorded, so the
+    next run tries them again.
+    """
+
+    def __init__(self, path="site_index.db", max_age=7 * 24 * 3600):
+        self.path = path
+        self.max_age = max_age
+        self.stats = Counter()
+        self._lock = threading.Lock()
+        self.db = sqlite3.connect(path, check_same_thread=False)
+        self.db.execute("PRAGMA journal_mode=WAL")
+        self.db.executescript(SCHEMA)
+        self.db.commit()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def get(self, url):
+        """The last agency dict scraped from `url`'s site plus its age, or None."""
+        with self._lock:
+            row = self.db.execute(
+                "SELECT url, title, emails, scraped FROM sites WHERE site = ?", (site_key(url),)
+            ).fetchone()
+        if row is None:
+            return None
+        url, title, emails, scraped = row
+        agency = {"title": title, "url": url, "emails": json.loads(emails), "links": [],
+                  "error": None}
+        return agency, time.time() - scraped
+
+    def plan(self, hits, skip_known=False):
+        """Split search hits into (hits to scrape, agencies already known).
+
+        Only the first hit on each site is kept. Known sites come back from
+        the index if they are fresh; with `skip_known` they are dropped
+        whatever their age.
+        """
+        to_scrape, known, seen = [], [], set()
+        for hit in hits:
+            url = canonical_url(hit.get("href") or "")
+            site = site_key(url) if url else ""
+            if not site or site in seen:
+                self.stats["duplicate_hits"] += 1
+                continue
+            seen.add(site)
+            found = self.get(url)
+            if found and skip_known:
+                self.stats["known_skipped"] += 1
+            elif found and found[1] < self.max_age:
+                self.stats["known_reused"] += 1
+                known.append(found[0])
+            else:
+                if found:
+                    self.stats["known_refreshed"] += 1
+                to_scrape.append(hit)
+        return to_scrape, known
+
+    def record(self, agency):
+        """Remember a freshly scraped agency, unless its scrape failed."""
+        url = canonical_url(agency["url"] or "")
+        if not url:
+            return
+        if agency.get("error"):
+            # A timeout isn't "no emails"; keep whatever an earlier run found
+            self.stats["failed_not_recorded"] += 1
+            return
+        with self._lock:
+            self.db.execute(
+                "INSERT OR REPLACE INTO sites VALUES (?, ?, ?, ?, ?)",
+                (site_key(url), agency["url"], agency["title"],
+                 json.dumps(sorted(agency["emails"])), time.time())
+            )
+            self.db.commit()
+
+    def close(self):
+        self.db.close()
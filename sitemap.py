@@ -0,0 +1,50 @@
+import html
+import re
+
+from frontier import score_link
+from urls import canonical_url, site_key
+
+# Child sitemaps read from a sitemap index, pages-like ones first
+MAX_CHILD_SITEMAPS = 2
+# Contact-like pages kept per site
+MAX_PAGES = 20
+
+LOC_RE = re.compile(rb"<loc>\s*(.*?)\s*</loc>", re.IGNORECASE | re.DOTALL)
+INDEX_RE = re.compile(rb"<sitemapindex\b", re.IGNORECASE)
+# Child sitemaps of posts, products and taxonomies never list a contact page
+SKIP_SITEMAPS = ("post", "product", "tag", "categor", "author", "image", "video", "news")
+
+
+def parse_sitemap(content):
+    """(page URLs, child sitemap URLs) listed in a sitemap or sitemap index.
+
+    Only the <loc> entries are read, with a regex rather than an XML
+    parser, so a truncated or sloppy sitemap still gives what it has.
+    """
+    locs = [html.unescape(loc.decode("utf-8", "replace")) for loc in LOC_RE.findall(content)]
+    if INDEX_RE.search(content):
+        return [], locs
+    return locs, []
+
+
+def child_sitemaps(urls):
+    """The children of a sitemap index worth reading, most promising first."""
+    def rank(url):
+        url = url.lower()
+        if "page" in url:
+            return 0
+        return 2 if any(word in url for word in SKIP_SITEMAPS) else 1
+
+    return [url for url in sorted(urls, key=rank) if rank(url) < 2][:MAX_CHILD_SITEMAPS]
+
+
+def contact_pages(urls, root_url):
+    """The URLs on `root_url`'s site that look like contact pages, best first."""
+    site, scored = site_key(root_url), {}
+    for url in urls:
+        url = canonical_url(url)
+        if url and url not in scored and site_key(url) == site:
+            scored[url] = score_link(url)
+    ranked = sorted((url for url, score in scored.items() if score > 0), key=lambda u: -scored[u])
+    return ranked[:MAX_PAGES]
+
@@ -0,0 +1,140 @@
+import queue
+import smtplib
+from contextlib import contextmanager
+
+from rate_limit import RATE_LIMIT_CODES
+
+MAX_MESSAGES_PER_CONNECTION = 100
+# Codes that mean the server is closing (or has closed) the session
+RECONNECT_CODES = [421]
+
+
+class SMTPConnection:
+    """One authenticated SMTP session that carries many messages.
+
+    The session is opened lazily, checked with RSET before every message
+    after the first, and reopened once it has carried `max_messages` or
+    the server drops it.
+    """
+
+    def __init__(self, host, port, username=None, password=None, starttls=True,
+                 timeout=30, max_messages=MAX_MESSAGES_PER_CONNECTION):
+        self.host = host
+        self.port = port
+        self.username = username
+        self.password = password
+        self.starttls = starttls
+        self.timeout = timeout
+        self.max_messages = max_messages
+        self.server = None
+        self.sent = 0
+
+    def connect(self):
+        self.close()
+        server = smtplib.SMTP(self.host, self.port, timeout=self.timeout)
+        try:
+            if self.starttls:
+                server.starttls()
+            if self.username:
+                server.login(self.username, self.password)
+        except Exception:
+            server.close()
+            raise
+        self.server = server
+        self.sent = 0
+
+    def close(self):
+        if self.server is None:
+            return
+        try:
+            self.server.quit()
+        except (smtplib.SMTPException, OSError):
+            self.server.close()
+        self.server = None
+
+    def _ready(self):
+        """Make sure there is a live session with room for another message."""
+        if self.server is None or self.sent >= self.max_messages:
+            self.connect()
+        elif self.sent:
+            try:
+                code, _ = self.server.rset()
+            except (smtplib.SMTPServerDisconnected, OSError):
+                code = None
+            if code != 250:
+                self.connect()
+
+    def send(self, sender, recipients, message):
+        """Send one message, reconnecting once if the server drops the session.
+
+        A 421 is the server throttling us rather than a dead connection: the
+        session is closed and the error raised, so the caller backs off
+        instead of resending straight away.
+        """
+        self._ready()
+        try:
+            result = self.server.sendmail(sender, recipients, message)
+        except (smtplib.SMTPException, ConnectionError) as e:
+            if not session_dropped(e):
+                self.sent += 1
+                raise
+            if smtp_error_code(e) in RATE_LIMIT_CODES:
+                self.close()
+                raise
+            self.connect()
+            result = self.server.sendmail(sender, recipients, message)
+        self.sent += 1
+        return result
+
+
+def smtp_error_code(error):
+    """The SMTP reply code behind an exception, or None if there isn't one."""
+    if isinstance(error, smtplib.SMTPRecipientsRefused):
+        codes = [code for code, _ in error.recipients.values()]
+        return codes[0] if codes else None
+    return getattr(error, "smtp_code", None)
+
+
+def session_dropped(error):
+    """True if an SMTP error means the session is gone rather than the message refused."""
+    if isinstance(error, (smtplib.SMTPServerDisconnected, ConnectionError)):
+        return True
+    if isinstance(error, smtplib.SMTPRecipientsRefused):
+        return all(code in RECONNECT_CODES for code, _ in error.recipients.values())
+    return smtp_error_code(error) in RECONNECT_CODES
+
+
+class SMTPConnectionPool:
+    """A fixed set of reusable SMTPConnections shared between senders."""
+
+    def __init__(self, host, port, username=None, password=None, size=1, **options):
+        self._idle = queue.Queue()
+        self._connections = [
+            SMTPConnection(host, port, username, password, **options)
+            for _ in range(size)
+        ]
+        for conn in self._connections:
+            self._idle.put(conn)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    @contextmanager
+    def connection(self):
+        """Borrow a connection for as long as the block runs."""
+        conn = self._idle.get()
+        try:
+            yield conn
+        finally:
+            self._idle.put(conn)
+
+    def send(self, sender, recipients, message):
+        with self.connection() as conn:
+            return conn.send(sender, recipients, message)
+
+    def close(self):
+        for conn in self._connections:
+            conn.close()
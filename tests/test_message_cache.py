@@ -0,0 +1,31 @@
+import re
+import smtplib
+from email.mime.multipart import MIMEMultipart
+from email.mime.text import MIMEText
+
+import pytest
+
+from message_cache import MessageTemplate
+
+BOUNDARY_RE = re.compile(rb"=+\d+==")
+
+
+def as_string_wire(sender, subject, body, recipient):
+    """What building a message per recipient and sending as_string() puts on the wire."""
+    msg = MIMEMultipart()
+    msg['Subject'] = subject
+    msg['From'] = sender
+    msg['To'] = recipient
+    msg.attach(MIMEText(body, 'plain'))
+    return smtplib._fix_eols(msg.as_string()).encode("ascii")
+
+
+@pytest.mark.parametrize("sender, subject, body, recipient", [
+    ("me@test.dev", "Hi", "Plain body\n", "a@test.dev"),
+    ("Zoë <me@test.dev>", "Partnership opportunité — " * 6, "Héllo\r\nthere " * 40, "a@test.dev"),
+    ("me@test.dev", "A long subject line that has to be folded " * 4, "x" * 2000, "ünï@test.dev"),
+])
+def test_render_matches_per_recipient_as_string(sender, subject, body, recipient):
+    rendered = MessageTemplate(sender, subject, body).render(recipient)
+    expected = as_string_wire(sender, subject, body, recipient)
+    assert BOUNDARY_RE.sub(b"B", rendered) == BOUNDARY_RE.sub(b"B", expected)
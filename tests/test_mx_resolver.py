@@ -0,0 +1,126 @@
+import socket
+
+import pytest
+
+import mx_resolver
+from mx_resolver import MXResolver, LookupFailed, system_lookup
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+ANSWERS = {
+    "live.test": (["mx.live.test"], 3600),
+    "gone.test": ([], 600),  # NXDOMAIN or null MX
+    "unknown.test": (None, 600),  # no address and no way to see MX records
+}
+
+
+def stub_lookup(calls):
+    def lookup(domain):
+        calls.append(domain)
+        if domain == "flaky.test":
+            raise LookupFailed("SERVFAIL")
+        return ANSWERS[domain]
+    return lookup
+
+
+def test_only_missing_domains_are_undeliverable():
+    resolver = MXResolver(stub_lookup([]))
+    emails = ["a@live.test", "b@gone.test", "c@unknown.test", "d@flaky.test", "e@GONE.test"]
+    deliverable, undeliverable = resolver.partition(emails)
+    assert deliverable == ["a@live.test", "c@unknown.test", "d@flaky.test"]
+    assert undeliverable == ["b@gone.test", "e@GONE.test"]
+
+
+def test_answers_are_cached_until_their_ttl():
+    calls, clock = [], FakeClock()
+    resolver = MXResolver(stub_lookup(calls), clock=clock)
+    resolver.resolve_many(["live.test", "gone.test", "flaky.test"])
+    resolver.resolve_many(["live.test", "gone.test", "flaky.test"])
+    assert sorted(calls) == ["flaky.test", "gone.test", "live.test"]
+
+    clock.now = mx_resolver.ERROR_TTL + 1
+    resolver.resolve_many(["live.test", "gone.test", "flaky.test"])
+    assert calls.count("flaky.test") == 2 and calls.count("gone.test") == 1
+
+    clock.now = 3601
+    resolver.resolve_many(["live.test", "gone.test"])
+    assert calls.count("live.test") == 2 and calls.count("gone.test") == 2
+
+
+@pytest.fixture
+def without_dnspython(monkeypatch):
+    monkeypatch.setattr(mx_resolver, "DNSPYTHON_AVAILABLE", False)
+
+
+def fail_getaddrinfo(errno):
+    def getaddrinfo(*args, **kwargs):
+        raise socket.gaierror(errno, "lookup failed")
+    return getaddrinfo
+
+
+def test_no_address_is_unknown_not_missing(without_dnspython, monkeypatch):
+    monkeypatch.setattr(socket, "getaddrinfo", fail_getaddrinfo(socket.EAI_NONAME))
+    assert system_lookup("nomail.test") == (None, mx_resolver.NEGATIVE_TTL)
+
+
+def test_address_is_the_implicit_mx(without_dnspython, monkeypatch):
+    monkeypatch.setattr(socket, "getaddrinfo", lambda *args, **kwargs: [])
+    assert system_lookup("live.test") == (["live.test"], mx_resolver.DEFAULT_TTL)
+
+
+def test_resolver_failure_raises_lookup_failed(without_dnspython, monkeypatch):
+    monkeypatch.setattr(socket, "getaddrinfo", fail_getaddrinfo(socket.EAI_AGAIN))
+    with pytest.raises(LookupFailed):
+        system_lookup("slow.test")
+
+
+class FakeDNS:
+    """Just enough of dnspython for system_lookup, raising `error` for every query."""
+
+    class DNSException(Exception):
+        pass
+
+    class NXDOMAIN(DNSException):
+        pass
+
+    class NoAnswer(DNSException):
+        pass
+
+    def __init__(self, error):
+        self.exception = self.resolver = self
+        self.error = error
+
+    def resolve(self, domain, rdtype, lifetime=None):
+        raise self.error
+
+
+@pytest.fixture
+def fake_dns(monkeypatch):
+    def install(error):
+        monkeypatch.setattr(mx_resolver, "DNSPYTHON_AVAILABLE", True)
+        monkeypatch.setattr(mx_resolver, "dns", FakeDNS(error), raising=False)
+    return install
+
+
+def test_nxdomain_is_missing(fake_dns):
+    fake_dns(FakeDNS.NXDOMAIN())
+    assert system_lookup("gone.test") == ([], mx_resolver.NEGATIVE_TTL)
+
+
+def test_no_mx_records_falls_back_to_the_address(fake_dns, monkeypatch):
+    fake_dns(FakeDNS.NoAnswer())
+    monkeypatch.setattr(socket, "getaddrinfo", lambda *args, **kwargs: [])
+    assert system_lookup("live.test") == (["live.test"], mx_resolver.DEFAULT_TTL)
+
+
+def test_dns_timeout_raises_lookup_failed(fake_dns):
+    fake_dns(FakeDNS.DNSException("timed out"))
+    with pytest.raises(LookupFailed):
+        system_lookup("slow.test")
@@ -0,0 +1,52 @@
+from rate_limit import TokenBucket
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.now += seconds
+
+
+def send_times(limiter, clock, until):
+    times = []
+    while True:
+        limiter.acquire()
+        if clock.now >= until:
+            return times
+        times.append(clock.now)
+
+
+def test_hourly_cap_holds_in_the_first_hour():
+    clock = FakeClock()
+    limiter = TokenBucket(per_second=1, per_hour=100, clock=clock, sleep=clock.sleep)
+    assert len(send_times(limiter, clock, 3600)) == 100
+
+
+def test_hourly_cap_holds_over_any_hour():
+    clock = FakeClock()
+    limiter = TokenBucket(per_second=1, per_hour=100, clock=clock, sleep=clock.sleep)
+    times = send_times(limiter, clock, 4 * 3600)
+    assert len(times) == 400
+    for i, start in enumerate(times):
+        assert sum(1 for t in times[i:] if t < start + 3600) <= 100
+
+
+def test_per_second_pace_without_hourly_cap():
+    clock = FakeClock()
+    limiter = TokenBucket(per_second=2, clock=clock, sleep=clock.sleep)
+    assert len(send_times(limiter, clock, 60)) == 120
+
+
+def test_backoff_pauses_and_halves_the_pace():
+    clock = FakeClock()
+    limiter = TokenBucket(per_second=1, cooldown=60, clock=clock, sleep=clock.sleep)
+    limiter.acquire()
+    limiter.backoff()
+    assert limiter.rate == 0.5
+    limiter.acquire()
+    assert clock.now >= 60
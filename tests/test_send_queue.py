@@ -0,0 +1,25 @@
+from send_queue import SendQueue
+
+
+def test_pending_retries_failed_until_max_attempts(tmp_path):
+    with SendQueue(str(tmp_path / "queue.db"), "c1", flush_every=1) as queue:
+        queue.add(["a@test.dev", "b@test.dev", "c@test.dev"])
+        queue.mark("a@test.dev", True)
+        for _ in range(3):
+            queue.mark("b@test.dev", False, "550 no such user")
+        queue.mark("c@test.dev", False, "451 try later")
+
+        assert queue.pending() == []
+        assert queue.pending(retry_failed=True) == ["c@test.dev"]
+        assert queue.pending(retry_failed=True, max_attempts=4) == ["b@test.dev", "c@test.dev"]
+
+
+def test_campaigns_are_kept_apart(tmp_path):
+    path = str(tmp_path / "queue.db")
+    with SendQueue(path, "c1") as queue:
+        queue.add(["a@test.dev"])
+        queue.mark("a@test.dev", True)
+    with SendQueue(path, "c2") as queue:
+        queue.add(["a@test.dev"])
+        assert queue.sent() == set()
+        assert queue.pending() == ["a@test.dev"]
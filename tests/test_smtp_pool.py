@@ -0,0 +1,146 @@
+import asyncio
+import smtplib
+import socket
+
+import pytest
+
+pytest.importorskip("aiosmtpd")
+from aiosmtpd.controller import Controller
+
+from smtp_pool import SMTPConnection, smtp_error_code
+
+
+class Handler:
+    """Accepts every message, counting sessions and RSETs.
+
+    `throttle` is a recipient refused with 421 once; `closing` makes the
+    next RSET answer 421 as a server does before dropping an idle session.
+    """
+
+    def __init__(self):
+        self.sessions = set()
+        self.delivered = []
+        self.rsets = 0
+        self.throttle = None
+        self.closing = False
+
+    async def handle_RCPT(self, server, session, envelope, address, rcpt_options):
+        if address == self.throttle:
+            self.throttle = None
+            return "421 4.7.0 Too many messages, slow down"
+        envelope.rcpt_tos.append(address)
+        return "250 OK"
+
+    async def handle_RSET(self, server, session, envelope):
+        self.rsets += 1
+        if self.closing:
+            self.closing = False
+            return "421 4.4.2 Idle too long, closing"
+        return "250 OK"
+
+    async def handle_DATA(self, server, session, envelope):
+        self.sessions.add(session.peer)
+        self.delivered.extend(envelope.rcpt_tos)
+        return "250 OK"
+
+
+def free_port():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+@pytest.fixture
+def smtpd():
+    handler = Handler()
+    controller = Controller(handler, hostname="127.0.0.1", port=free_port())
+    controller.start()
+    handler.config = {"host": "127.0.0.1", "port": controller.port, "starttls": False}
+    yield handler
+    controller.stop()
+
+
+MESSAGE = "Subject: Hi\r\n\r\nHello"
+
+
+def test_messages_share_one_session_with_rset_between(smtpd):
+    conn = SMTPConnection(**smtpd.config)
+    for i in range(3):
+        conn.send("me@test.dev", [f"r{i}@test.dev"], MESSAGE)
+    conn.close()
+    assert smtpd.delivered == ["r0@test.dev", "r1@test.dev", "r2@test.dev"]
+    assert len(smtpd.sessions) == 1
+    assert smtpd.rsets == 2
+
+
+def test_new_session_after_max_messages(smtpd):
+    conn = SMTPConnection(max_messages=2, **smtpd.config)
+    for i in range(3):
+        conn.send("me@test.dev", [f"r{i}@test.dev"], MESSAGE)
+    conn.close()
+    assert len(smtpd.sessions) == 2
+
+
+def test_reconnects_when_rset_fails(smtpd):
+    conn = SMTPConnection(**smtpd.config)
+    conn.send("me@test.dev", ["r0@test.dev"], MESSAGE)
+    smtpd.closing = True
+    conn.send("me@test.dev", ["r1@test.dev"], MESSAGE)
+    conn.close()
+    assert smtpd.delivered == ["r0@test.dev", "r1@test.dev"]
+    assert len(smtpd.sessions) == 2
+
+
+def test_421_is_raised_not_resent(smtpd):
+    conn = SMTPConnection(**smtpd.config)
+    conn.send("me@test.dev", ["r0@test.dev"], MESSAGE)
+    smtpd.throttle = "r1@test.dev"
+    with pytest.raises(smtplib.SMTPRecipientsRefused) as refused:
+        conn.send("me@test.dev", ["r1@test.dev"], MESSAGE)
+    assert smtp_error_code(refused.value) == 421
+    assert smtpd.delivered == ["r0@test.dev"]
+
+    conn.send("me@test.dev", ["r2@test.dev"], MESSAGE)
+    conn.close()
+    assert smtpd.delivered == ["r0@test.dev", "r2@test.dev"]
+    assert len(smtpd.sessions) == 2
+
+
+def test_async_session_raises_421_and_reuses_sessions(smtpd):
+    pytest.importorskip("aiosmtplib")
+    from async_sender import AsyncSMTPSession, smtp_error_code as async_error_code
+
+    async def run():
+        session = AsyncSMTPSession(**smtpd.config)
+        try:
+            await session.send("me@test.dev", ["r0@test.dev"], MESSAGE)
+            await session.send("me@test.dev", ["r1@test.dev"], MESSAGE)
+            smtpd.throttle = "r2@test.dev"
+            with pytest.raises(Exception) as refused:
+                await session.send("me@test.dev", ["r2@test.dev"], MESSAGE)
+            await session.send("me@test.dev", ["r3@test.dev"], MESSAGE)
+        finally:
+            await session.close()
+        return async_error_code(refused.value)
+
+    assert asyncio.run(run()) == 421
+    assert smtpd.delivered == ["r0@test.dev", "r1@test.dev", "r3@test.dev"]
+    assert len(smtpd.sessions) == 2
+    assert smtpd.rsets >= 1
+
+
+def test_send_stream_backs_off_on_421(smtpd, monkeypatch):
+    import rate_limit
+    import workflow
+
+    backoffs = []
+    monkeypatch.setattr(rate_limit.TokenBucket, "backoff", lambda self: backoffs.append(1))
+    smtpd.throttle = "r1@test.dev"
+    results = []
+    workflow.send_stream([f"r{i}@test.dev" for i in range(3)], smtpd.config, "me@test.dev",
+                         "Hi", "Hello", per_second=1000,
+                         on_result=lambda email, success, message, code, latency:
+                         results.append((email, success, code)))
+    assert results == [("r0@test.dev", True, 250), ("r1@test.dev", False, 421),
+                       ("r2@test.dev", True, 250)]
+    assert backoffs == [1]
@@ -0,0 +1,137 @@
+"""The search, scrape and send steps shared by the GUI and pipeline.py.
+
+Nothing here imports Qt, and the engines behind each step (ddgs, requests,
+smtplib, asyncio) are only imported when the step runs, so the GUI can
+import this module at startup.
+"""
+import queue
+import time
+from threading import Thread
+
+from crawler import MAX_WORKERS, PER_HOST, MAX_BYTES
+from politeness import HOST_DELAY
+from rate_limit import report_attempt
+from scrape_cache import CACHE_TTL
+from search import SEARCH_WORKERS, REGION
+from search_cache import SEARCH_TTL
+
+SEND_QUEUE_PATH = "send_queue.db"
+SCRAPE_CACHE_PATH = "scrape_cache.db"
+SITE_INDEX_PATH = "site_index.db"
+SEARCH_CACHE_PATH = "search_cache.db"
+SEND_LOG_PATH = "send_log.csv"
+# Recipients found but not yet sent; bounds memory when scraping outruns sending
+BACKLOG = 1000
+
+
+def search_sites(queries, max_results, workers=SEARCH_WORKERS, on_query=None, on_error=None,
+                 region=REGION, ttl=SEARCH_TTL):
+    """Merged hits for every query, reusing searches from the last `ttl` seconds.
+
+    Returns (hits, stats), with the search cache's hit and miss counts.
+    """
+    from search import search_many
+    from search_cache import SearchCache
+
+    with SearchCache(SEARCH_CACHE_PATH, ttl) as cache:
+        hits = search_many(queries, max_results, workers, on_query=on_query,
+                           on_error=on_error, cache=cache, region=region)
+        return hits, dict(cache.stats)
+
+
+def scrape_sites(hits, max_workers=MAX_WORKERS, per_host=PER_HOST, cache_ttl=CACHE_TTL,
+                 deep=True, on_error=None, delay=HOST_DELAY, skip_known=False,
+                 max_bytes=MAX_BYTES, discover=False, on_plan=None, stats=None):
+    """Yield one scraped agency per site in the search hits, as sites finish.
+
+    Hits are planned against the SiteIndex first: sites scraped within
+    `cache_ttl` seconds are yielded from it straight away (or dropped
+    with `skip_known`), several hits on one site are crawled once, and
+    each freshly scraped site is recorded. `on_plan(total)` is told how
+    many agencies are coming once that is known, and the `stats` dict
+    is kept up to date with the crawler's and index's counts.
+    """
+    from crawler import Crawler
+    from scrape_cache import ScrapeCache
+    from site_index import SiteIndex
+
+    stats = {} if stats is None else stats
+    with SiteIndex(SITE_INDEX_PATH, cache_ttl) as index:
+        hits, known = index.plan(hits, skip_known)
+        if on_plan:
+            on_plan(len(hits) + len(known))
+        stats.update(index.stats)
+        yield from known
+
+        with ScrapeCache(SCRAPE_CACHE_PATH, cache_ttl) as cache, \
+                Crawler(max_workers, per_host, on_error=on_error, cache=cache, delay=delay,
+                        max_bytes=max_bytes, discover=discover) as crawler:
+            for agency in crawler.crawl(hits, deep=deep):
+                index.record(agency)
+                stats.update(crawler.stats)
+                stats.update(index.stats)
+                yield agency
+            stats.update(crawler.stats)
+
+
+def send_stream(emails, smtp_config, sender_email, subject, plain_text, connections=1,
+                per_second=1/3, per_hour=None, on_result=None):
+    """Send one message per address over `connections` pooled SMTP connections.
+
+    `emails` may be a list or a generator still being filled by a crawl:
+    workers wait for more recipients until it is exhausted. Every
+    connection draws from one shared TokenBucket, and the body is encoded
+    once, with only the To: header changing per recipient.
+    """
+    from smtp_pool import SMTPConnectionPool, smtp_error_code
+    from rate_limit import TokenBucket
+    from message_cache import MessageTemplate
+
+    pending = queue.Queue(BACKLOG)
+    limiter = TokenBucket(per_second, per_hour)
+    template = MessageTemplate(sender_email, subject, plain_text)
+
+    def worker(pool):
+        with pool.connection() as conn:
+            while True:
+                email = pending.get()
+                if email is None:
+                    return
+                started = time.monotonic()
+                try:
+                    limiter.acquire()
+                    started = time.monotonic()
+                    conn.send(sender_email, email, template.render(email))
+                except Exception as e:
+                    report_attempt(email, started, limiter, on_result, e, smtp_error_code)
+                else:
+                    report_attempt(email, started, limiter, on_result)
+
+    with SMTPConnectionPool(size=connections, **smtp_config) as pool:
+        workers = [Thread(target=worker, args=(pool,)) for _ in range(connections)]
+        for w in workers:
+            w.start()
+        try:
+            for email in emails:
+                pending.put(email)
+        finally:
+            for _ in workers:
+                pending.put(None)
+            for w in workers:
+                w.join()
+
+
+def send_async(emails, smtp_config, sender_email, subject, plain_text, connections=1,
+               per_second=1/3, per_hour=None, on_result=None):
+    """send_stream on asyncio sessions (aiosmtplib) instead of threads.
+
+    The addresses are collected first, so a crawl finishes before sending starts.
+    """
+    import asyncio
+    from async_sender import send_campaign
+
+    return asyncio.run(send_campaign(
+        list(emails), smtp_config, sender_email, subject, plain_text,
+        connections=connections, per_second=per_second, per_hour=per_hour,
+        on_result=on_result
+    ))